@@ -0,0 +1,138 @@
+# benchmarks/bench_analyze_script.py
+"""
+analyze_script on a synthetic long script vs. the previous implementation
+(regexes compiled per call, one match attempt per field, then the five
+label-stripping re.sub passes per scene the UI ran afterwards).
+
+    python -m benchmarks.bench_analyze_script --scenes 10000
+"""
+import argparse
+import random
+import re
+import time
+from typing import Any, Dict, Optional
+
+from modules.video import analyze_script, iter_scenes
+
+def synthetic_script(scenes: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    labels = {
+        "🎥": ["Camera direction: ", "camera direction:", ""],
+        "💡": ["Lighting suggestion: ", ""],
+        "🎶": ["Music style suggestion: ", ""],
+        "🔄": ["Transition: ", ""],
+        "🖼": ["On-screen text: ", ""],
+    }
+    lines = ["🎬 Title", '"Coffee hacks you need"', "", "📜 Full Script Breakdown"]
+    for i in range(scenes):
+        start = i * 3
+        lines.append(f"⏱ {start}s–{start + 3}s")
+        lines.append(f'✅ Narration: "Step {i}: grind the beans {rng.randint(1, 9)} times"')
+        if rng.random() < 0.3:
+            lines.append(f"✅ and then stir for {rng.randint(2, 20)} seconds")
+        for emoji, options in labels.items():
+            if rng.random() < 0.85:
+                lines.append(f'{emoji} {rng.choice(options)}"shot detail {i} {emoji}"')
+        lines.append("")
+    return "\n".join(lines)
+
+def legacy_analyze_script(script_text: str) -> Dict[str, Any]:
+    lines = (script_text or "").splitlines()
+    result = {"title": "", "goal": "", "delivery_notes": "", "equipment": "", "duration": "", "scenes": []}
+    current_scene: Optional[Dict[str, Any]] = None
+
+    time_range_re = re.compile(r'(\d+)s\s*[–-]\s*(\d+)s')
+    narration_re = re.compile(r'^\s*✅.*?["“](.*?)["”]?$')
+    field_res = [
+        ("camera", re.compile(r'^🎥\s*(.*)', re.I)),
+        ("lighting", re.compile(r'^💡\s*(.*)', re.I)),
+        ("music", re.compile(r'^🎶\s*(.*)', re.I)),
+        ("transition", re.compile(r'^🔄\s*(.*)', re.I)),
+        ("onscreen_text", re.compile(r'^🖼\s*(.*)', re.I)),
+    ]
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        m = time_range_re.search(line)
+        if m:
+            if current_scene:
+                result["scenes"].append(current_scene)
+            s, e = int(m.group(1)), int(m.group(2))
+            current_scene = {"start": f"{s}s", "end": f"{e}s", "start_seconds": s, "end_seconds": e,
+                             "text": "", "camera": "", "lighting": "", "music": "", "transition": "",
+                             "onscreen_text": ""}
+            trailing = line[m.end():].strip()
+            if trailing:
+                cleaned = trailing.lstrip('✅').strip(' –—:-').strip(' "“”')
+                if cleaned:
+                    current_scene["text"] = cleaned
+            continue
+        if not current_scene:
+            continue
+        for name, field_re in field_res:
+            if (m := field_re.match(line)):
+                current_scene[name] = m.group(1).strip('" ')
+                break
+        else:
+            if line.lstrip().startswith('✅'):
+                narr_m = narration_re.match(line)
+                if narr_m and narr_m.group(1).strip():
+                    chunk = narr_m.group(1).strip()
+                else:
+                    without_check = line.lstrip('✅').strip()
+                    chunk = without_check.split(':', 1)[1].strip(' "“”') if ':' in without_check else without_check
+                if chunk:
+                    current_scene["text"] = (current_scene["text"] + " " + chunk).strip()
+    if current_scene:
+        result["scenes"].append(current_scene)
+
+    # the per-scene clean-up the Streamlit card and the script step used to run
+    labels = [("camera", r"^Camera direction:\s*"), ("lighting", r"^Lighting suggestion:\s*"),
+              ("music", r"^Music style suggestion:\s*"), ("transition", r"^Transition:\s*"),
+              ("onscreen_text", r"^On-screen text:\s*")]
+    for scene in result["scenes"]:
+        for name, pattern in labels:
+            if scene.get(name):
+                scene[name] = re.sub(pattern, "", scene[name], flags=re.I).strip('" ')
+    return result
+
+def check_edge_cases() -> None:
+    """Script shapes the synthetic generator doesn't produce."""
+    # clock times inside narration are not scene ranges
+    scenes = analyze_script('0s-5s\n🎥 close-up\n✅ "we are open 9:00-17:00 every day"\n5s-10s\n✅ Say: bye')["scenes"]
+    assert [(s["start_seconds"], s["end_seconds"]) for s in scenes] == [(0, 5), (5, 10)], scenes
+    assert scenes[0]["text"] == "we are open 9:00-17:00 every day", scenes[0]
+    # header residue is not scene text; a bare clock range still opens a scene at line start
+    scenes = analyze_script("Scene 1 (0-5s)\nScene 2 – 5s–8s\n0:08-0:12 Wrap up")["scenes"]
+    assert [(s["start_seconds"], s["end_seconds"], s["text"]) for s in scenes] == \
+        [(0, 5, ""), (5, 8, ""), (8, 12, "Wrap up")], scenes
+
+def best_of(fn, arg, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenes", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    check_edge_cases()
+    script = synthetic_script(args.scenes)
+    assert analyze_script(script) == legacy_analyze_script(script), "outputs differ"
+    assert list(iter_scenes(script.splitlines())) == analyze_script(script)["scenes"], "line iterable differs"
+
+    legacy = best_of(legacy_analyze_script, script, args.repeat)
+    current = best_of(analyze_script, script, args.repeat)
+    print(f"{args.scenes} scenes, {len(script.splitlines())} lines — identical output")
+    print(f"  legacy  {legacy * 1000:8.1f} ms")
+    print(f"  current {current * 1000:8.1f} ms  ({legacy / current:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/bench_edit_log.py
+"""
+A Video Studio session of stacked edits on a long plan: the previous flow
+(join the whole history, reparse it and reapply from the base plan on every
+Apply) vs. modules.edit_log.EditLog (parse and apply only the new edit), plus
+undo/reset on the log.
+
+    python -m benchmarks.bench_edit_log --scenes 1000 --edits 200
+"""
+import argparse
+import time
+
+from benchmarks.bench_analyze_script import synthetic_script
+from benchmarks.bench_edit_parser import synthetic_history
+from modules.edit_log import EditLog
+from modules.video import (analyze_script, apply_edit_commands, build_assembly_plan,
+                           parse_nl_edit_request, plan_footage)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenes", type=int, default=1000)
+    parser.add_argument("--edits", type=int, default=200)
+    args = parser.parse_args()
+
+    plan = build_assembly_plan(plan_footage(analyze_script(synthetic_script(args.scenes))["scenes"]), {})
+    history = synthetic_history(args.edits)
+
+    t0 = time.perf_counter()
+    for n in range(1, len(history) + 1):
+        replayed = apply_edit_commands(plan, parse_nl_edit_request("\n".join(history[:n])))
+    t_replay = time.perf_counter() - t0
+
+    log = EditLog(plan)
+    t0 = time.perf_counter()
+    for text in history:
+        log.apply(text)
+    t_log = time.perf_counter() - t0
+    assert list(log.plan) == replayed, "plans differ"
+
+    t0 = time.perf_counter()
+    for _ in range(len(history)):
+        log.undo()
+    log.reset()
+    t_undo = time.perf_counter() - t0
+
+    shared = sum(a is b for a, b in zip(log.entries[-1].plan, log.entries[-2].plan))
+    print(f"{args.scenes} scenes, {args.edits} applies")
+    print(f"  reparse + reapply  {t_replay * 1000:9.1f} ms")
+    print(f"  edit log           {t_log * 1000:9.1f} ms  ({t_replay / t_log:.0f}x)")
+    print(f"  {args.edits} undos + reset {t_undo * 1000:6.2f} ms")
+    print(f"  last snapshot shares {shared}/{len(plan)} items with the one before")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/bench_edit_parser.py
+"""
+parse_nl_edit_request on a long stacked edit history (the Video Studio joins
+every instruction so far and reparses on each apply) vs. the previous parser:
+one regex scan of the whole text per command type, patterns rebuilt per call.
+
+On the old phrasing both produce the same commands; the old parser's literal
+prefixes make its scans cheap, but the tokenizer's cost stays one pass however
+many command types there are. The second history mixes in the phrasing only
+the grammar understands (ranges, "all scenes", ms units, crossfades, slow
+down) to show what the old parser dropped.
+
+    python -m benchmarks.bench_edit_parser --instructions 500
+"""
+import argparse
+import random
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from modules.timeline import parse_timestamp
+from modules.video import parse_nl_edit_request
+
+_SCENE_REF = r'(?:the\s+)?scene\s+(?:(\d+)|at\s+(\d+(?::\d{2})?(?:\.\d+)?)s?)'
+
+def _scene_target(number: Optional[str], at: Optional[str]) -> str:
+    return f"scene:{int(number)}" if number else f"at:{parse_timestamp(at)}"
+
+def legacy_parse(nl: str) -> List[Dict[str, Any]]:
+    if not nl:
+        return []
+    text = nl.lower().strip()
+    cmds = []
+    for m in re.finditer(rf'trim\s+{_SCENE_REF}\s+to\s+([0-9.]+)s', text):
+        cmds.append({"type": "trim", "target": _scene_target(m.group(1), m.group(2)), "value": float(m.group(3))})
+    for m in re.finditer(rf'speed(?:\s+up)?\s+{_SCENE_REF}\s+by\s+([0-9.]+)x', text):
+        cmds.append({"type": "speed", "target": _scene_target(m.group(1), m.group(2)), "value": float(m.group(3))})
+    for m in re.finditer(rf'(?:apply\s+)?zoom-?in\s+on\s+{_SCENE_REF}', text):
+        cmds.append({"type": "zoom", "target": _scene_target(m.group(1), m.group(2)), "value": "in"})
+    for m in re.finditer(rf'captions?\s+"([^"]+)"\s+on\s+{_SCENE_REF}', text):
+        cmds.append({"type": "caption", "target": _scene_target(m.group(2), m.group(3)), "value": m.group(1)})
+    if "lower music" in text:
+        db = -6.0
+        m = re.search(r'by\s+([0-9.]+)\s*d?b', text)
+        if m:
+            db = -abs(float(m.group(1)))
+        cmds.append({"type": "music_gain", "target": "global", "value": db})
+    return cmds
+
+def synthetic_history(instructions: int, seed: int = 11) -> List[str]:
+    """Instructions in the phrasing both parsers understand (captions lower-case,
+    since the old parser lower-cased them)."""
+    rng = random.Random(seed)
+    templates = [
+        lambda: f"trim scene {rng.randint(1, 40)} to {rng.randint(1, 9)}.{rng.randint(0, 9)}s",
+        lambda: f"speed up scene {rng.randint(1, 40)} by {rng.choice(['1.25', '1.5', '2'])}x",
+        lambda: f"apply zoom-in on scene {rng.randint(1, 40)}",
+        lambda: f'add captions "step {rng.randint(1, 99)}" on scene {rng.randint(1, 40)}',
+        lambda: f"trim the scene at 0:{rng.randint(10, 59)} to 2s",
+    ]
+    return [rng.choice(templates)() for _ in range(instructions)]
+
+def extended_history(instructions: int, seed: int = 13) -> List[str]:
+    rng = random.Random(seed)
+    templates = [
+        lambda: f"cut scenes {rng.randint(1, 10)}-{rng.randint(11, 20)} to {rng.randint(500, 3000)}ms",
+        lambda: f'add captions "Step {rng.randint(1, 99)}" on all scenes',
+        lambda: f"slow down scenes {rng.randint(1, 20)}, {rng.randint(21, 40)} by 2x",
+        lambda: f"cut {rng.randint(1, 3)} seconds from scene {rng.randint(1, 40)}",
+        lambda: f"add crossfade {rng.choice([200, 300, 500])}ms between scenes",
+        lambda: f"boost music {rng.randint(1, 6)}db",
+    ]
+    return [rng.choice(templates)() for _ in range(instructions)]
+
+def key(cmd) -> tuple:
+    if isinstance(cmd, dict):
+        return cmd["type"], cmd["target"], cmd["value"]
+    return cmd.type, cmd.target, cmd.value
+
+def best_of(fn, arg, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--instructions", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    history = synthetic_history(args.instructions)
+    text = "\n".join(history)
+    assert sorted(map(key, parse_nl_edit_request(text))) == sorted(map(key, legacy_parse(text))), "commands differ"
+
+    legacy = best_of(legacy_parse, text, args.repeat)
+    current = best_of(parse_nl_edit_request, text, args.repeat)
+    print(f"{args.instructions} stacked instructions ({len(text)} chars) — same commands")
+    print(f"  legacy  {legacy * 1000:8.2f} ms")
+    print(f"  current {current * 1000:8.2f} ms  ({legacy / current:.2f}x)")
+
+    extended = "\n".join(extended_history(args.instructions))
+    print(f"{args.instructions} instructions in the extended phrasing: "
+          f"legacy {len(legacy_parse(extended))} commands, current {len(parse_nl_edit_request(extended))}")
+
+    # the Studio reparses the whole history on every apply: cost of the full session
+    t0 = time.perf_counter()
+    for n in range(1, len(history) + 1):
+        parse_nl_edit_request("\n".join(history[:n]))
+    print(f"  session of {len(history)} applies (reparse each time): {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
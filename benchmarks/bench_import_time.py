@@ -0,0 +1,86 @@
+# benchmarks/bench_import_time.py
+"""
+Cold import cost of Auri's modules, measured with `python -X importtime` in a
+fresh interpreter per module. Also flags heavy third-party packages (openai,
+supabase, gtts, Coqui TTS/torch, moviepy, PIL) that got loaded eagerly.
+
+    python -m benchmarks.bench_import_time --budget-ms 150
+
+Exits non-zero when a module exceeds the budget or drags in a heavy package.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+MODULES = [
+    "ideation.generator",
+    "modules.feedback",
+    "modules.script",
+    "modules.captions",
+    "modules.hashtags",
+    "modules.tts",
+    "modules.thumbnail",
+    "modules.video",
+    "modules.segment_cache",
+    "modules.ffmpeg_runner",
+    "modules.video_editor",
+    "modules.workflow_plan",
+    "modules.workflow",
+]
+
+# imported only on first use; finding one at import time is a regression
+HEAVY_PACKAGES = ["openai", "httpx", "supabase", "gtts", "TTS", "torch", "moviepy", "PIL", "requests"]
+
+# streamlit itself is the app's runtime and is excluded from each module's budget
+BASELINE = "streamlit"
+
+def import_profile(module: str) -> Tuple[Dict[str, int], str]:
+    """Cumulative import time (µs) per top-level package for a fresh `import module`."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=root, capture_output=True, text=True)
+    cumulative: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not cum.isdigit():
+            continue   # header row
+        top = name.strip().split(".")[0]
+        cumulative[top] = max(cumulative.get(top, 0), int(cum))
+        if name.strip() == module:
+            cumulative[module] = int(cum)
+    error = proc.stderr.strip().splitlines()[-1] if proc.returncode else ""
+    return cumulative, error
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=float, default=150.0,
+                        help="max import time per module, excluding streamlit")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    failures: List[str] = []
+    print(f"{'module':<24} {'total ms':>9} {'excl. st':>9}  heavy packages loaded")
+    for module in args.modules:
+        profile, error = import_profile(module)
+        if error:
+            print(f"{module:<24} {'-':>9} {'-':>9}  import failed: {error}")
+            continue
+        total = profile.get(module, 0) / 1000
+        own = max(0.0, total - profile.get(BASELINE, 0) / 1000)
+        heavy = [pkg for pkg in HEAVY_PACKAGES if pkg in profile]
+        print(f"{module:<24} {total:9.1f} {own:9.1f}  {', '.join(heavy) or '-'}")
+        if own > args.budget_ms:
+            failures.append(f"{module}: {own:.1f} ms > {args.budget_ms:.0f} ms budget")
+        if heavy:
+            failures.append(f"{module}: eagerly imports {', '.join(heavy)}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_input_seek.py
+"""
+Time to render a 5s cut from a long source at increasing offsets: the
+generated filtergraph command (input-side -ss/-t) vs. the previous one that
+cut with trim/atrim filters and so decoded from frame 0 up to the cut.
+
+    python -m benchmarks.bench_input_seek --minutes 20 --offsets 0 60 300 1140
+
+Needs ffmpeg/ffprobe and bash.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from modules.video import AssemblyItem, compile_ffmpeg_script
+from modules.video_editor import FFMPEG, ffmpeg_available
+
+def make_source(path: str, seconds: float) -> None:
+    # small frames and a short GOP keep generation quick; decode cost still grows with length
+    subprocess.run([FFMPEG, "-y", "-v", "error",
+                    "-f", "lavfi", "-i", f"testsrc2=size=640x360:rate=30:duration={seconds}",
+                    "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+                    "-c:v", "libx264", "-preset", "ultrafast", "-g", "60", "-c:a", "aac", "-shortest", path],
+                   check=True)
+
+def timed(args) -> float:
+    t0 = time.perf_counter()
+    subprocess.run(args, check=True, capture_output=True)
+    return time.perf_counter() - t0
+
+def legacy_command(src: str, ss: float, ee: float, out: str):
+    graph = (f"[0:v]trim=start={ss}:end={ee},setpts=PTS-STARTPTS[v0];"
+             f"[0:a]atrim=start={ss}:end={ee},asetpts=PTS-STARTPTS[a0];"
+             "[v0][a0]concat=n=1:v=1:a=1[v][a]")
+    return [FFMPEG, "-y", "-i", src, "-filter_complex", graph, "-map", "[v]", "-map", "[a]", out]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=float, default=20.0)
+    parser.add_argument("--cut", type=float, default=5.0)
+    parser.add_argument("--offsets", type=float, nargs="+", default=[0, 60, 300, 1140])
+    args = parser.parse_args()
+    if not ffmpeg_available():
+        sys.exit("ffmpeg not found")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "long.mp4")
+        make_source(src, args.minutes * 60)
+        print(f"{args.cut:.0f}s cut from a {args.minutes:.0f} min source")
+        print(f"  {'offset':>8} {'trim filter':>12} {'input seek':>11}")
+        for offset in args.offsets:
+            ss, ee = offset, offset + args.cut
+            t_legacy = timed(legacy_command(src, ss, ee, os.path.join(tmp, "legacy.mp4")))
+            plan = [AssemblyItem(scene_index=0, use_stock=False, filename="long.mp4",
+                                 start_seconds=ss, end_seconds=ee, caption="seek")]   # caption forces the filtergraph
+            sh, _ = compile_ffmpeg_script(plan, tmp, os.path.join(tmp, "seek.mp4"), stream_copy=False)
+            t_seek = timed(["bash", sh])
+            print(f"  {offset:7.0f}s {t_legacy:11.2f}s {t_seek:10.2f}s")
+
+if __name__ == "__main__":
+    main()
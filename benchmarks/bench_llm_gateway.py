@@ -0,0 +1,62 @@
+# benchmarks/bench_llm_gateway.py
+"""
+Drive modules.llm.chat_completion against the local stub with injected 429s
+and slow replies: many identical concurrent prompts (coalesced into one
+upstream call) plus distinct prompts (rate limited and retried).
+
+    python -m benchmarks.bench_llm_gateway --sessions 20 --rate-limit-ratio 0.3 --latency 0.2
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_openai import StubHandler, start_stub_server
+from modules.llm import chat_completion
+from modules.llm_gateway import DeadlineExceeded, get_llm_gateway
+from modules.openai_client import close_openai_clients, get_openai_client
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--distinct", type=int, default=10)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.3)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--deadline", type=float, default=10.0)
+    args = parser.parse_args()
+
+    StubHandler.latency = args.latency
+    StubHandler.rate_limit_ratio = args.rate_limit_ratio
+    server, base_url = start_stub_server()
+    client = get_openai_client("sk-bench", base_url=base_url)
+    gateway = get_llm_gateway()
+
+    def ask(prompt: str) -> str:
+        try:
+            return chat_completion(client, [{"role": "user", "content": prompt}],
+                                   use_cache=False, deadline=args.deadline)
+        except DeadlineExceeded:
+            return "deadline"
+
+    try:
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+            same = list(pool.map(ask, ["same workflow-plan prompt"] * args.sessions))
+        t_same = time.perf_counter() - t0
+        seen_same = StubHandler.requests_seen
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+            distinct = list(pool.map(ask, [f"prompt {i}" for i in range(args.distinct)]))
+        t_distinct = time.perf_counter() - t0
+    finally:
+        close_openai_clients()
+        server.shutdown()
+
+    print(f"identical x{args.sessions}: {t_same:.2f}s, upstream requests {seen_same}, "
+          f"coalesced {gateway.single_flight.coalesced}, ok {sum(r == 'stub reply' for r in same)}")
+    print(f"distinct  x{args.distinct}: {t_distinct:.2f}s, ok {sum(r == 'stub reply' for r in distinct)}, "
+          f"deadline misses {distinct.count('deadline')}")
+    print(f"stub 429s injected {StubHandler.rate_limited}, gateway retries {gateway.retries}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# benchmarks/bench_minimal_footage.py
+"""
+Near-duplicate shot grouping (modules.video.group_similar_visuals) on a large
+multi-idea plan vs. a brute-force all-pairs comparison with the same rule.
+
+    python -m benchmarks.bench_minimal_footage --scenes 2000
+"""
+import argparse
+import random
+import time
+
+from modules.video import SHOT_SIMILARITY_THRESHOLD, group_similar_visuals, visual_tokens
+
+SUBJECTS = ["hands", "coffee", "beans", "grinder", "kettle", "mug", "milk", "kitchen", "desk", "laptop",
+            "plant", "window", "dog", "street", "notebook", "pen", "shelf", "oven", "bread", "knife"]
+ACTIONS = ["stirring", "pouring", "grinding", "holding", "opening", "tapping", "slicing", "carrying"]
+FRAMES = ["Close-up of", "close up:", "Wide shot of", "Overhead view of", "Selfie with", "Slow pan across"]
+
+def synthetic_visuals(n: int, seed: int = 11):
+    rng = random.Random(seed)
+    return [f"{rng.choice(FRAMES)} {rng.choice(SUBJECTS)} {rng.choice(ACTIONS)} the "
+            f"{rng.choice(SUBJECTS)} near your {rng.choice(SUBJECTS)}" for _ in range(n)]
+
+def brute_force(visuals, threshold):
+    sets = [visual_tokens(v) for v in visuals]
+    groups, reps = [], []
+    for pos, tokens in enumerate(sets):
+        best, best_sim = None, threshold
+        for gid, rep in enumerate(reps):
+            union = len(tokens | rep)
+            sim = len(tokens & rep) / union if union else 1.0
+            if sim >= best_sim and (best is None or sim > best_sim):
+                best, best_sim = gid, sim
+        if best is None:
+            groups.append([pos])
+            reps.append(tokens)
+        else:
+            groups[best].append(pos)
+    return groups
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenes", type=int, default=2000)
+    parser.add_argument("--threshold", type=float, default=SHOT_SIMILARITY_THRESHOLD)
+    args = parser.parse_args()
+
+    visuals = synthetic_visuals(args.scenes)
+    t0 = time.perf_counter()
+    indexed = group_similar_visuals(visuals, args.threshold)
+    t_index = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    brute = brute_force(visuals, args.threshold)
+    t_brute = time.perf_counter() - t0
+
+    exact = len({v.lower() for v in visuals})
+    print(f"{args.scenes} visuals: {exact} distinct strings -> {len(indexed)} shots "
+          f"(threshold {args.threshold}; all-pairs finds {len(brute)})")
+    print(f"  inverted index {t_index * 1000:8.1f} ms")
+    print(f"  all pairs      {t_brute * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
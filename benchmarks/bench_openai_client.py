@@ -0,0 +1,51 @@
+# benchmarks/bench_openai_client.py
+"""
+Per-call latency of a fresh OpenAI client per call (old behaviour) versus the
+pooled client from modules.openai_client, against a local stub server.
+
+    python -m benchmarks.bench_openai_client --calls 200
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.stub_openai import start_stub_server
+from modules.openai_client import close_openai_clients, get_openai_client
+
+MESSAGES = [{"role": "user", "content": "ping"}]
+
+def _time_calls(make_client, calls: int) -> list:
+    samples = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        client = make_client()
+        client.chat.completions.create(model="gpt-4o", messages=MESSAGES, temperature=0.7)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+def _report(label: str, samples: list) -> None:
+    ms = sorted(s * 1000 for s in samples)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(f"{label:<22} mean {statistics.mean(ms):7.2f} ms   median {statistics.median(ms):7.2f} ms   p95 {p95:7.2f} ms")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    from openai import OpenAI
+
+    server, base_url = start_stub_server()
+    try:
+        per_call = _time_calls(lambda: OpenAI(api_key="sk-bench", base_url=base_url), args.calls)
+        pooled = _time_calls(lambda: get_openai_client("sk-bench", base_url=base_url), args.calls)
+    finally:
+        close_openai_clients()
+        server.shutdown()
+
+    print(f"{args.calls} calls against {base_url}")
+    _report("new client per call", per_call)
+    _report("pooled registry", pooled)
+
+if __name__ == "__main__":
+    main()
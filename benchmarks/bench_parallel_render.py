@@ -0,0 +1,61 @@
+# benchmarks/bench_parallel_render.py
+"""
+Wall time of modules.video_editor.render_segmented on synthetic clips
+(ffmpeg's testsrc2 video + sine audio) as the worker count grows. Each run
+starts from an empty segment cache so every scene is encoded.
+
+    python -m benchmarks.bench_parallel_render --scenes 10 --seconds 6 --workers 1 2 4 8 16
+
+Needs ffmpeg and ffprobe on PATH (or AURI_FFMPEG / AURI_FFPROBE).
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from modules.segment_cache import SegmentCache
+from modules.video import AssemblyItem
+from modules.video_editor import FFMPEG, FINAL_PROFILE, ffmpeg_available, render_segmented
+
+def make_clip(path: str, seconds: float, seed: int) -> None:
+    subprocess.run([FFMPEG, "-y", "-v", "error",
+                    "-f", "lavfi", "-i", f"testsrc2=size=1280x720:rate=30:duration={seconds}",
+                    "-f", "lavfi", "-i", f"sine=frequency={220 + 20 * seed}:duration={seconds}",
+                    "-c:v", "libx264", "-preset", "veryfast", "-c:a", "aac", "-shortest", path], check=True)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenes", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=6.0)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+    if not ffmpeg_available():
+        sys.exit("ffmpeg not found")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assets = os.path.join(tmp, "assets")
+        os.makedirs(assets)
+        plan = []
+        for i in range(args.scenes):
+            make_clip(os.path.join(assets, f"clip_{i}.mp4"), args.seconds, i)
+            plan.append(AssemblyItem(scene_index=i, use_stock=False, filename=f"clip_{i}.mp4",
+                                     start_seconds=0.5, end_seconds=args.seconds - 0.5,
+                                     caption=f"Scene {i + 1}" if i % 2 else None))
+
+        print(f"{args.scenes} scenes x {args.seconds - 1:.0f}s at {FINAL_PROFILE.width}x{FINAL_PROFILE.height}, "
+              f"{os.cpu_count()} CPUs")
+        baseline = None
+        for workers in args.workers:
+            cache = SegmentCache(os.path.join(tmp, f"segments_{workers}"), max_bytes=1 << 40)
+            t0 = time.perf_counter()
+            result = render_segmented(plan, assets, os.path.join(tmp, f"out_{workers}.mp4"),
+                                      cache=cache, workers=workers)
+            wall = time.perf_counter() - t0
+            baseline = baseline or wall
+            print(f"  workers {result['workers']:3d}  {wall:7.2f} s  ({baseline / wall:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_pipeline.py
+"""
+Time the content pipeline end to end:
+ideas → script → analyze_script → plan_footage → build_assembly_plan → compile_ffmpeg_script.
+
+Record once against the real services, then replay offline as often as needed:
+
+    OPENAI_API_KEY=sk-... python -m benchmarks.bench_pipeline --mode record
+    python -m benchmarks.bench_pipeline --mode replay --runs 20
+
+Fixtures live in --fixtures (default fixtures/replay); see modules.replay.
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from ideation.generator import generate_ideas
+from modules import replay
+from modules.llm_metrics import get_llm_metrics
+from modules.script import generate_script
+from modules.video import analyze_script, build_assembly_plan, compile_ffmpeg_script, plan_footage
+
+GOAL = "Grow my TikTok coffee channel with short, punchy 30-second recipe videos"
+
+def run_pipeline(goal: str, out_dir: str) -> Dict[str, float]:
+    """One pass through the pipeline; returns seconds spent per stage."""
+    timings: Dict[str, float] = {}
+
+    def timed(stage, fn, *args, **kwargs):
+        t0 = time.perf_counter()
+        result = fn(*args, **kwargs)
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - t0
+        return result
+
+    ideas = [i for i in timed("ideas", generate_ideas, goal) if i.strip()]
+    script = timed("script", generate_script, goal, previous_output=ideas[0] if ideas else None)
+    parsed = timed("analyze_script", analyze_script, script)
+    planned = timed("plan_footage", plan_footage, parsed["scenes"])
+    selections = {f"scene_{p['scene_index']}": {"use_stock": False, "filename": f"clip_{p['scene_index']}.mp4"}
+                  for p in planned}
+    plan = timed("build_assembly_plan", build_assembly_plan, planned, selections)
+    timed("compile_ffmpeg_script", compile_ffmpeg_script, plan, out_dir, os.path.join(out_dir, "final.mp4"))
+    return timings
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mode", choices=[replay.RECORD, replay.REPLAY], default=replay.REPLAY)
+    parser.add_argument("--fixtures", default=os.path.join("fixtures", "replay"))
+    parser.add_argument("--goal", default=GOAL)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    replay.configure(args.mode, args.fixtures)
+    runs = 1 if args.mode == replay.RECORD else args.runs
+    totals: List[float] = []
+    per_stage: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as out_dir:
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            for stage, secs in run_pipeline(args.goal, out_dir).items():
+                per_stage[stage] = per_stage.get(stage, 0.0) + secs
+            totals.append(time.perf_counter() - t0)
+
+    print(f"{args.mode}: {runs} run(s), end-to-end avg {sum(totals) / len(totals) * 1000:.1f} ms, "
+          f"min {min(totals) * 1000:.1f} ms")
+    for stage, secs in per_stage.items():
+        print(f"  {stage:<22} {secs / runs * 1000:8.2f} ms")
+    print(f"  LLM calls recorded: {len(get_llm_metrics().records())}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_preview.py
+"""
+Studio turnaround after one trim: full-quality render vs. the 360p preview
+profile, for the whole reel and for just the changed scene plus neighbors.
+Every run starts from an empty segment cache.
+
+    python -m benchmarks.bench_preview --scenes 10 --seconds 6
+
+Needs ffmpeg and ffprobe.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_parallel_render import make_clip
+from modules.edit_log import EditLog
+from modules.segment_cache import SegmentCache
+from modules.video import FINAL_PROFILE, PREVIEW_PROFILE, AssemblyItem
+from modules.video_editor import ffmpeg_available, render_segmented
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenes", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=6.0)
+    args = parser.parse_args()
+    if not ffmpeg_available():
+        sys.exit("ffmpeg not found")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assets = os.path.join(tmp, "assets")
+        os.makedirs(assets)
+        plan = []
+        for i in range(args.scenes):
+            make_clip(os.path.join(assets, f"clip_{i}.mp4"), args.seconds, i)
+            plan.append(AssemblyItem(scene_index=i, use_stock=False, filename=f"clip_{i}.mp4",
+                                     start_seconds=0.0, end_seconds=args.seconds))
+        log = EditLog(plan)
+        log.apply(f"trim scene {args.scenes // 2} to 2s")
+        scenes = log.preview_scenes()
+
+        runs = [("final, all scenes", FINAL_PROFILE, None),
+                ("preview, all scenes", PREVIEW_PROFILE, None),
+                (f"preview, {len(scenes)} scenes", PREVIEW_PROFILE, scenes)]
+        baseline = None
+        print(f"{args.scenes} scenes x {args.seconds:.0f}s, one trim applied")
+        for n, (label, profile, subset) in enumerate(runs):
+            items = [it for it in log.plan if subset is None or it["scene_index"] in subset]
+            cache = SegmentCache(os.path.join(tmp, f"segments_{n}"), max_bytes=1 << 40)
+            t0 = time.perf_counter()
+            render_segmented(items, assets, os.path.join(tmp, f"out_{n}.mp4"), profile=profile, cache=cache)
+            wall = time.perf_counter() - t0
+            baseline = baseline or wall
+            print(f"  {label:<22} {wall:7.2f} s  ({wall / baseline:.0%} of final)")
+
+if __name__ == "__main__":
+    main()
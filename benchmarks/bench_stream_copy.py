@@ -0,0 +1,52 @@
+# benchmarks/bench_stream_copy.py
+"""
+A cut-and-join reel (no speed, zoom or caption) through compile_ffmpeg_script:
+the stream-copy fast path vs. the single re-encoding filtergraph. Both
+generated .sh scripts are run and timed.
+
+    python -m benchmarks.bench_stream_copy --scenes 10 --seconds 20
+
+Needs ffmpeg/ffprobe and bash.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_parallel_render import make_clip
+from modules.video import AssemblyItem, compile_ffmpeg_script
+from modules.video_editor import ffmpeg_available
+
+def run_script(sh_path: str) -> float:
+    t0 = time.perf_counter()
+    subprocess.run(["bash", sh_path], check=True, capture_output=True)
+    return time.perf_counter() - t0
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenes", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    args = parser.parse_args()
+    if not ffmpeg_available():
+        sys.exit("ffmpeg not found")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_clip(os.path.join(tmp, "source.mp4"), args.seconds * args.scenes, 0)
+        span = args.seconds
+        plan = [AssemblyItem(scene_index=i, use_stock=False, filename="source.mp4",
+                             start_seconds=i * span + 1.0, end_seconds=(i + 1) * span - 1.0)
+                for i in range(args.scenes)]
+
+        copy_sh, _ = compile_ffmpeg_script(plan, tmp, os.path.join(tmp, "copy.mp4"))
+        graph_sh, _ = compile_ffmpeg_script(plan, tmp, os.path.join(tmp, "graph.mp4"), stream_copy=False)
+        t_graph = run_script(graph_sh)
+        t_copy = run_script(copy_sh)
+
+        print(f"{args.scenes} cuts of {span - 2:.0f}s from one {span * args.scenes:.0f}s source")
+        print(f"  filtergraph re-encode {t_graph:7.2f} s")
+        print(f"  stream copy + concat  {t_copy:7.2f} s  ({t_graph / t_copy:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# benchmarks/bench_timeline.py
+"""
+"Which scene plays at t" on a long plan: linear scan vs. modules.timeline.TimelineIndex.
+
+    python -m benchmarks.bench_timeline --scenes 10000 --queries 2000
+"""
+import argparse
+import random
+import time
+
+from modules.timeline import Interval, TimelineIndex
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenes", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    intervals, t = [], 0.0
+    for i in range(args.scenes):
+        duration = rng.uniform(1.0, 6.0)
+        intervals.append(Interval(t, t + duration, i))
+        t += duration
+    points = [rng.uniform(0, t) for _ in range(args.queries)]
+
+    t0 = time.perf_counter()
+    index = TimelineIndex(intervals)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    indexed = [index.first_at(p).item for p in points]
+    t_index = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    scanned = [next(iv.item for iv in intervals if iv.start <= p < iv.end) for p in points]
+    t_scan = time.perf_counter() - t0
+
+    assert indexed == scanned
+    print(f"{args.scenes} scenes, {args.queries} point queries")
+    print(f"  linear scan {t_scan * 1000:9.1f} ms")
+    print(f"  index       {t_index * 1000:9.1f} ms  (+{t_build * 1000:.1f} ms build)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/stub_openai.py
+"""
+Minimal local stand-in for the OpenAI chat-completions endpoint.
+
+    python -m benchmarks.stub_openai --port 8765
+
+Point clients at it with AURI_OPENAI_BASE_URL=http://127.0.0.1:8765/v1.
+--rate-limit-ratio injects 429 responses and --latency slows every reply,
+for exercising the retry, deadline and coalescing logic in modules.llm_gateway.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+def _completion_body(content: str, model: str) -> bytes:
+    return json.dumps({
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }).encode("utf-8")
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, so pooled clients can reuse sockets
+    reply = "stub reply"
+    latency = 0.0
+    rate_limit_ratio = 0.0
+    requests_seen = 0
+    rate_limited = 0
+    _count_lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, body: bytes, extra_headers: Optional[dict] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        cls = type(self)
+        with cls._count_lock:
+            cls.requests_seen += 1
+            throttled = random.random() < self.rate_limit_ratio
+            if throttled:
+                cls.rate_limited += 1
+        if throttled:
+            body = json.dumps({"error": {"message": "Rate limit reached (stub)", "type": "requests",
+                                         "code": "rate_limit_exceeded"}}).encode("utf-8")
+            self._send_json(429, body, {"retry-after-ms": "50"})
+            return
+        if self.latency:
+            time.sleep(self.latency)
+        self._send_json(200, _completion_body(self.reply, payload.get("model", "gpt-4o")))
+
+def start_stub_server(port: int = 0,
+                      handler: type = StubHandler) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stub on a daemon thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, bound_port = server.server_address[:2]
+    return server, f"http://{host}:{bound_port}/v1"
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to sleep per request")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="fraction of requests answered with 429")
+    args = parser.parse_args(argv)
+    StubHandler.latency = args.latency
+    StubHandler.rate_limit_ratio = args.rate_limit_ratio
+    server, base_url = start_stub_server(args.port)
+    print(f"Stub OpenAI endpoint at {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
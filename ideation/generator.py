@@ -1,8 +1,8 @@
-from openai import OpenAI
 from ideation.prompts import content_idea_prompt
-import streamlit as st
+from modules.llm import chat_completion
+from modules.openai_client import get_openai_client
 
-client = OpenAI(api_key=st.secrets["openai"]["api_key"])
+IDEAS_PROMPT_VERSION = "ideas-v1"
 
 def is_idea_or_repurpose_step(title: str, auri_text: str) -> bool:
     keywords = [
@@ -14,7 +14,7 @@ def is_idea_or_repurpose_step(title: str, auri_text: str) -> bool:
     return any(kw in combined_text for kw in keywords)
 
 def generate_ideas(full_prompt: str, user_input: str = None, count: int = 3):
-    client = OpenAI(api_key=st.secrets["openai"]["api_key"])
+    client = get_openai_client()
 
     system_prompt = f"""
 You are Auri, an AI content strategist helping a creator generate viral content ideas.
@@ -40,10 +40,13 @@ Respond only in this format:
 .
 """
 
-    response = client.chat.completions.create(
-        model="gpt-4o",
+    content = chat_completion(
+        client,
         messages=[{"role": "system", "content": system_prompt}],
+        model="gpt-4o",
         temperature=0.7,
+        prompt_version=IDEAS_PROMPT_VERSION,
+        step="ideation",
     )
 
-    return response.choices[0].message.content.strip().split("\n")
+    return content.split("\n")
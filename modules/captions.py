@@ -1,9 +1,29 @@
-from openai import OpenAI
+import json
+from modules.llm import chat_completion
+from modules.openai_client import get_openai_client
+from modules.hashtags import normalize_hashtags
+from modules.prompt_budget import fit_fields
+
+CAPTION_PROMPT_VERSION = "caption-v1"
+CAPTION_HASHTAGS_PROMPT_VERSION = "caption-hashtags-v1"
+
+# JSON shape returned by generate_caption_and_hashtags (checked by validate_caption_hashtags)
+CAPTION_HASHTAGS_SCHEMA = {
+    "type": "object",
+    "required": ["caption", "hashtags"],
+    "properties": {
+        "caption": {"type": "string", "minLength": 1},
+        "hashtags": {"type": "array", "items": {"type": "string"}, "minItems": 1},
+    },
+}
 
 def generate_caption(goal, platform, tone, idea, script, openai_key, language="English"):
     if not all([goal, platform, tone, idea, script]):
         return "⚠️ Missing information to generate a caption."
 
+    fields = fit_fields("caption", {"goal": goal, "idea": idea, "script": script})
+    goal, idea, script = fields["goal"], fields["idea"], fields["script"]
+
     if language == "עברית":
         prompt = f"""
 אתה Auri, מומחה לאסטרטגיית תוכן ברשתות חברתיות.
@@ -58,12 +78,131 @@ Include:
 """
 
     try:
-        client = OpenAI(api_key=openai_key)
-        response = client.chat.completions.create(
-            model="gpt-4o",
+        client = get_openai_client(openai_key)
+        return chat_completion(
+            client,
             messages=[{"role": "user", "content": prompt}],
+            model="gpt-4o",
             temperature=0.7,
+            prompt_version=CAPTION_PROMPT_VERSION,
+            step="caption",
         )
-        return response.choices[0].message.content.strip()
     except Exception as e:
         return f"⚠️ Error generating caption: {str(e)}"
+
+
+def validate_caption_hashtags(raw):
+    """
+    Parse and check a combined response against CAPTION_HASHTAGS_SCHEMA.
+    Returns {"caption": str, "hashtags": [str, ...]} or raises ValueError.
+    """
+    try:
+        payload = json.loads(raw) if isinstance(raw, str) else raw
+    except json.JSONDecodeError as e:
+        raise ValueError(f"response is not valid JSON: {e}") from e
+    if not isinstance(payload, dict):
+        raise ValueError("response must be a JSON object")
+    missing = [k for k in CAPTION_HASHTAGS_SCHEMA["required"] if k not in payload]
+    if missing:
+        raise ValueError(f"missing keys: {', '.join(missing)}")
+
+    caption = payload["caption"]
+    if not isinstance(caption, str) or not caption.strip():
+        raise ValueError("'caption' must be a non-empty string")
+    tags = payload["hashtags"]
+    if not isinstance(tags, list) or not all(isinstance(t, str) for t in tags):
+        raise ValueError("'hashtags' must be a list of strings")
+    tags = normalize_hashtags(tags)
+    if not tags:
+        raise ValueError("'hashtags' must contain at least one tag")
+    return {"caption": caption.strip(), "hashtags": tags}
+
+def generate_caption_and_hashtags(goal, platform, tone, idea, script, openai_key, language="English"):
+    """
+    Combined mode: one request per post returning {"caption", "hashtags"}.
+    Sends goal/idea/script once instead of once per prompt. On failure the
+    caption carries the error text and hashtags is empty, matching the
+    error-string convention of generate_caption/generate_hashtags.
+    """
+    if not all([goal, platform, tone, idea, script]):
+        return {"caption": "⚠️ Missing information to generate a caption.", "hashtags": []}
+
+    fields = fit_fields("caption_hashtags", {"goal": goal, "idea": idea, "script": script})
+    goal, idea, script = fields["goal"], fields["idea"], fields["script"]
+
+    if language == "עברית":
+        prompt = f"""
+אתה Auri, מומחה לאסטרטגיית תוכן ברשתות חברתיות.
+
+🎯 מטרת הפוסט: "{goal}"
+📱 פלטפורמה: {platform}
+🎭 טון: {tone}
+💡 רעיון: "{idea}"
+📜 תסריט וידאו:
+\"\"\"
+{script}
+\"\"\"
+
+כתוב כיתוב מושלם לפוסט הזה, מותאם לפלטפורמה {platform}, ורשימה של 5–10 האשטגים רלוונטיים.
+
+כיתוב:
+- שורת פתיחה מושכת (hook)
+- אימוג'ים (רק אם מתאימים לפלטפורמה)
+- קריאה לפעולה טבעית (למשל “עקבו לעוד”)
+- עיצוב שורות שמתאים לפלטפורמה {platform}
+- ללא האשטגים בתוך הכיתוב
+- ⚠️ אל תחזור מילה במילה על התסריט או הרעיון
+
+האשטגים:
+- ללא האשטגים גנריים כמו #foryou, #viral
+- שילוב של תגיות רחבות ותגיות נישה, בעברית או באנגלית לפי מה שמתאים לקהל
+
+📦 החזר אובייקט JSON בלבד, בפורמט:
+{{"caption": "...", "hashtags": ["#tag1", "#tag2"]}}
+"""
+    else:
+        prompt = f"""
+You are Auri, an expert social media strategist.
+
+🎯 Goal: "{goal}"
+📱 Platform: {platform}
+🎭 Tone: {tone}
+💡 Idea: "{idea}"
+📜 Script:
+\"\"\"
+{script}
+\"\"\"
+
+Write a caption for this post, optimized for {platform}, and 5–10 hashtags for it.
+
+Caption:
+- A catchy hook (1st line)
+- Emojis (if platform appropriate)
+- A natural call-to-action (like “Follow for more”)
+- Line breaks and formatting that match {platform}'s style
+- ⚠️ No hashtags inside the caption
+- ⚠️ DO NOT repeat script or idea lines verbatim
+
+Hashtags:
+- No generic tags like #foryou, #viral, #fun
+- Mix high-reach (1M+) with niche-specific ones, customized for {platform}
+
+📦 Respond with a JSON object only, exactly in this shape:
+{{"caption": "...", "hashtags": ["#tag1", "#tag2"]}}
+"""
+
+    try:
+        client = get_openai_client(openai_key)
+        raw = chat_completion(
+            client,
+            messages=[{"role": "user", "content": prompt}],
+            model="gpt-4o",
+            temperature=0.7,
+            prompt_version=CAPTION_HASHTAGS_PROMPT_VERSION,
+            step="caption_hashtags",
+            response_format={"type": "json_object"},
+            validate=validate_caption_hashtags,
+        )
+        return validate_caption_hashtags(raw)
+    except Exception as e:
+        return {"caption": f"⚠️ Error generating caption and hashtags: {str(e)}", "hashtags": []}
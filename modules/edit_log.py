@@ -0,0 +1,139 @@
+# modules/edit_log.py
+"""
+Append-only log of Video Studio edits.
+
+Each entry holds the instruction text, its parsed commands and the plan it
+produces. A plan snapshot is a tuple of assembly items in which only the
+items the edit touched are new; everything else is shared with the previous
+snapshot. Applying an edit parses and applies just that edit, and moving the
+cursor (undo, redo, jump to any entry, reset to the base plan) is O(1).
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from modules.timeline import TimelineIndex, output_index
+from modules.video import EditCommand, apply_edit_commands, edit_globals, parse_nl_edit_request, scene_positions
+
+@dataclass(frozen=True)
+class EditEntry:
+    text: str                             # the instruction as typed ('' for the base plan)
+    commands: Tuple[EditCommand, ...]
+    plan: Tuple[Dict[str, Any], ...]      # shares untouched items with the parent's plan
+    music_gain_db: float = 0.0            # render-time globals, accumulated along the path
+    crossfade_ms: int = 0
+    parent: Optional[int] = None          # entry this edit was applied on top of
+
+class EditLog:
+    """
+    Entry 0 is the base plan. Entries are never changed or removed; applying
+    after an undo starts a new branch from the cursor, so earlier states stay
+    reachable by index.
+    """
+
+    def __init__(self, base_plan: Sequence[Dict[str, Any]]):
+        base = tuple(base_plan)
+        self._positions = scene_positions(base)
+        self.entries: List[EditEntry] = [EditEntry("", (), base)]
+        self.cursor = 0
+        self._redo: List[int] = []
+        self._timelines: Dict[int, TimelineIndex] = {}
+
+    @property
+    def current(self) -> EditEntry:
+        return self.entries[self.cursor]
+
+    @property
+    def plan(self) -> Tuple[Dict[str, Any], ...]:
+        return self.current.plan
+
+    @property
+    def base_plan(self) -> Tuple[Dict[str, Any], ...]:
+        return self.entries[0].plan
+
+    def apply(self, text: str) -> Optional[EditEntry]:
+        """Parse `text` and apply it on top of the current entry; None when it has no commands."""
+        commands = tuple(parse_nl_edit_request(text))
+        if not commands:
+            return None
+        head = self.current
+        music_gain_db, crossfade_ms = edit_globals(commands, head.music_gain_db, head.crossfade_ms)
+        # time targets resolve against the head's timeline, cached across edits
+        timeline = self.timeline() if any(cmd.target.startswith("at:") for cmd in commands) else None
+        plan = apply_edit_commands(head.plan, commands, self._positions, timeline)
+        entry = EditEntry(
+            text=text.strip(),
+            commands=commands,
+            plan=plan if plan is head.plan else tuple(plan),
+            music_gain_db=music_gain_db,
+            crossfade_ms=crossfade_ms,
+            parent=self.cursor,
+        )
+        self.entries.append(entry)
+        if plan is head.plan and self.cursor in self._timelines:   # only globals changed
+            self._timelines[len(self.entries) - 1] = self._timelines[self.cursor]
+        self.cursor = len(self.entries) - 1
+        self._redo.clear()
+        return entry
+
+    def can_undo(self) -> bool:
+        return self.current.parent is not None
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> EditEntry:
+        if self.can_undo():
+            self._redo.append(self.cursor)
+            self.cursor = self.current.parent
+        return self.current
+
+    def redo(self) -> EditEntry:
+        if self._redo:
+            self.cursor = self._redo.pop()
+        return self.current
+
+    def goto(self, index: int) -> EditEntry:
+        """Make entry `index` current (0 = base plan)."""
+        if not 0 <= index < len(self.entries):
+            raise IndexError(f"no edit #{index}")
+        self.cursor = index
+        self._redo.clear()
+        return self.current
+
+    def reset(self) -> EditEntry:
+        return self.goto(0)
+
+    def history(self) -> List[str]:
+        """Instruction texts from the base plan to the current entry."""
+        texts, index = [], self.cursor
+        while index:
+            entry = self.entries[index]
+            texts.append(entry.text)
+            index = entry.parent
+        return texts[::-1]
+
+    def changed_scenes(self) -> Set[int]:
+        """scene_index of every item the current edit replaced (snapshots share the rest by identity)."""
+        head = self.current
+        if head.parent is None:
+            return set()
+        before = self.entries[head.parent].plan
+        return {item["scene_index"] for item, old in zip(head.plan, before) if item is not old}
+
+    def preview_scenes(self, radius: int = 1) -> Optional[Set[int]]:
+        """Changed scenes plus `radius` neighbors on each side; None when nothing changed (preview everything)."""
+        changed = self.changed_scenes()
+        if not changed:
+            return None
+        plan = self.plan
+        picked = set()
+        for pos in (self._positions[s] for s in changed):
+            picked.update(plan[i]["scene_index"] for i in range(max(0, pos - radius), min(len(plan), pos + radius + 1)))
+        return picked
+
+    def timeline(self) -> TimelineIndex:
+        """Rendered-timeline index of the current plan, built once per entry."""
+        index = self._timelines.get(self.cursor)
+        if index is None:
+            index = self._timelines[self.cursor] = output_index(self.plan)
+        return index
@@ -1,11 +1,22 @@
 import streamlit as st
 from datetime import datetime
-from supabase import create_client
 import os
+import threading
 
-SUPABASE_URL = st.secrets["supabase"]["url"]
-SUPABASE_KEY = st.secrets["supabase"]["key"]
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+from modules.replay import replay_insert
+
+_supabase = None
+_supabase_lock = threading.Lock()
+
+def get_supabase():
+    """Shared Supabase client, created on first use rather than at import."""
+    global _supabase
+    if _supabase is None:
+        with _supabase_lock:
+            if _supabase is None:
+                from supabase import create_client
+                _supabase = create_client(st.secrets["supabase"]["url"], st.secrets["supabase"]["key"])
+    return _supabase
 
 def log_feedback(step_name, response, comment, language="English", platform="Web"):
     feedback = {
@@ -24,7 +35,7 @@ def log_feedback(step_name, response, comment, language="English", platform="Web
         st.session_state["auri_feedback"] = []
     st.session_state["auri_feedback"].append(feedback)
 
-    supabase.table("feedback").insert(feedback).execute()
+    replay_insert("feedback", feedback, lambda: get_supabase().table("feedback").insert(feedback).execute())
 
 def show_feedback_controls(step_key, step_title, regenerate_callback, language="English", platform="Web"):
     feedback_state = f"{step_key}_feedback_state"
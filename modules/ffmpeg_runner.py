@@ -0,0 +1,174 @@
+# modules/ffmpeg_runner.py
+"""
+Runs ffmpeg argv lists as child processes: no shell, so paths and captions
+are passed through untouched. `-progress pipe:1` is read into a percent
+complete, a threading.Event cancels a run, a timeout bounds it, and a
+failure is raised as FFmpegError with the tail of ffmpeg's stderr.
+"""
+import collections
+import os
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+FFMPEG = os.environ.get("AURI_FFMPEG", "ffmpeg")
+# seconds a terminated ffmpeg gets to finalize its output before it is killed
+KILL_GRACE_SECONDS = 5.0
+
+ProgressCallback = Callable[[float], None]   # called with 0..100
+
+class FFmpegError(RuntimeError):
+    """
+    A run that didn't produce its output. `reason` is 'failed' (non-zero
+    exit), 'cancelled', 'timeout' or 'not_found' (no ffmpeg binary).
+    """
+
+    def __init__(self, reason: str, message: str, argv: Sequence[str] = (),
+                 returncode: Optional[int] = None, stderr_tail: str = ""):
+        super().__init__(message)
+        self.reason = reason
+        self.argv = list(argv)
+        self.returncode = returncode
+        self.stderr_tail = stderr_tail
+
+@dataclass(frozen=True)
+class FFmpegResult:
+    argv: List[str]
+    returncode: int
+    elapsed: float          # wall-clock seconds
+    stderr_tail: str = ""   # warnings ffmpeg printed on a successful run
+
+def ffmpeg_available() -> bool:
+    return shutil.which(FFMPEG) is not None
+
+def _out_seconds(key: str, value: str) -> Optional[float]:
+    """Output position from one -progress line (out_time_ms is microseconds too, an ffmpeg quirk)."""
+    if key in ("out_time_us", "out_time_ms"):
+        try:
+            return int(value) / 1_000_000
+        except ValueError:   # 'N/A' before the first frame
+            return None
+    return None
+
+def run_ffmpeg(argv: Sequence[str],
+               duration: Optional[float] = None,
+               on_progress: Optional[ProgressCallback] = None,
+               cancel: Optional[threading.Event] = None,
+               timeout: Optional[float] = None) -> FFmpegResult:
+    """
+    Run one ffmpeg command to completion. An argv[0] of 'ffmpeg' (as in
+    exported scripts) resolves to AURI_FFMPEG. With `duration` (seconds of
+    output) `on_progress` receives the percent done as ffmpeg reports it;
+    without it, only 100 at the end. Setting `cancel` or exceeding `timeout`
+    terminates the process and raises FFmpegError.
+    """
+    argv = list(argv)
+    if argv and argv[0] == "ffmpeg":
+        argv[0] = FFMPEG
+    args = argv[:1] + ["-progress", "pipe:1", "-nostats"] + argv[1:]
+
+    started = time.monotonic()
+    try:
+        proc = subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, text=True, errors="replace")
+    except OSError as e:
+        raise FFmpegError("not_found", f"could not start {argv[0]}: {e}", argv) from e
+
+    # stderr is drained on its own thread so a chatty ffmpeg never blocks on a full pipe
+    stderr_lines = collections.deque(maxlen=20)
+    drain = threading.Thread(target=lambda: stderr_lines.extend(proc.stderr), daemon=True)
+    drain.start()
+
+    stopped = []   # reason set by the watchdog
+    finished = threading.Event()
+
+    def watchdog():
+        deadline = started + timeout if timeout else None
+        while not finished.wait(0.1):
+            if cancel is not None and cancel.is_set():
+                stopped.append("cancelled")
+            elif deadline is not None and time.monotonic() > deadline:
+                stopped.append("timeout")
+            else:
+                continue
+            _stop(proc)
+            return
+
+    guard = threading.Thread(target=watchdog, daemon=True)
+    guard.start()
+
+    last = -1.0
+    try:
+        for line in proc.stdout:
+            key, _, value = line.strip().partition("=")
+            seconds = _out_seconds(key, value)
+            if seconds is None or not duration or on_progress is None:
+                continue
+            percent = min(99.9, max(0.0, 100.0 * seconds / duration))
+            if percent - last >= 0.5:
+                last = percent
+                on_progress(percent)
+        returncode = proc.wait()
+    except BaseException:
+        # the caller is going away (Streamlit stop, KeyboardInterrupt): don't leave ffmpeg running
+        _stop(proc)
+        raise
+    finally:
+        finished.set()
+        guard.join()
+        drain.join(timeout=1.0)
+        proc.stdout.close()
+
+    tail = "".join(stderr_lines).strip()
+    if stopped:
+        reason = stopped[0]
+        elapsed = time.monotonic() - started
+        message = "render cancelled" if reason == "cancelled" else f"ffmpeg timed out after {elapsed:.1f}s"
+        raise FFmpegError(reason, message, argv, proc.returncode, tail)
+    if returncode != 0:
+        last_line = tail.splitlines()[-1] if tail else "no error output"
+        raise FFmpegError("failed", f"ffmpeg exited with {returncode}: {last_line}", argv, returncode, tail)
+    if on_progress is not None:
+        on_progress(100.0)
+    return FFmpegResult(argv, returncode, time.monotonic() - started, tail)
+
+def run_commands(commands: Sequence[Sequence[str]],
+                 duration: Optional[float] = None,
+                 on_progress: Optional[ProgressCallback] = None,
+                 cancel: Optional[threading.Event] = None,
+                 timeout: Optional[float] = None) -> List[FFmpegResult]:
+    """
+    Run commands in order (e.g. video.ffmpeg_commands), stopping at the first
+    failure. `duration` is the output length of the last command (the one
+    writing the final file); progress is split evenly across the commands and
+    `timeout` covers the whole sequence.
+    """
+    results = []
+    deadline = time.monotonic() + timeout if timeout else None
+    count = len(commands)
+    for i, argv in enumerate(commands):
+        step = None
+        if on_progress is not None:
+            step = lambda p, i=i: on_progress((i + p / 100.0) * 100.0 / count)
+        remaining = None
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise FFmpegError("timeout", f"ffmpeg commands timed out after {timeout:.1f}s", argv)
+        last = i == count - 1
+        results.append(run_ffmpeg(argv, duration if last else None, step, cancel, remaining))
+    return results
+
+def _stop(proc: subprocess.Popen) -> None:
+    """Ask ffmpeg to stop, then kill it if it hasn't exited within the grace period."""
+    if proc.poll() is not None:
+        return
+    proc.terminate()
+    try:
+        proc.wait(KILL_GRACE_SECONDS)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
@@ -1,9 +1,16 @@
-from openai import OpenAI
+from modules.llm import chat_completion
+from modules.openai_client import get_openai_client
+from modules.prompt_budget import fit_fields
+
+HASHTAGS_PROMPT_VERSION = "hashtags-v1"
 
 def generate_hashtags(goal, idea, script, platform, openai_key):
     if not all([goal, idea, script, platform]):
         return "⚠️ Missing information to generate hashtags."
 
+    fields = fit_fields("hashtags", {"goal": goal, "idea": idea, "script": script})
+    goal, idea, script = fields["goal"], fields["idea"], fields["script"]
+
     prompt = f"""
 You are Auri, an expert social media strategist.
 
@@ -30,12 +37,33 @@ Output format:
 """
 
     try:
-        client = OpenAI(api_key=openai_key)
-        response = client.chat.completions.create(
-            model="gpt-4o",
+        client = get_openai_client(openai_key)
+        return chat_completion(
+            client,
             messages=[{"role": "user", "content": prompt}],
+            model="gpt-4o",
             temperature=0.7,
+            prompt_version=HASHTAGS_PROMPT_VERSION,
+            step="hashtags",
         )
-        return response.choices[0].message.content.strip()
     except Exception as e:
         return f"⚠️ Error generating hashtags: {e}"
+
+
+def normalize_hashtags(tags):
+    """Clean a list of tags: strip, ensure a single leading '#', drop blanks and duplicates."""
+    out = []
+    seen = set()
+    for tag in tags or []:
+        t = "".join(str(tag).split()).lstrip("#")
+        if not t:
+            continue
+        t = "#" + t
+        if t.lower() not in seen:
+            seen.add(t.lower())
+            out.append(t)
+    return out
+
+def format_hashtags(tags):
+    """Render a hashtag list in the comma-separated form generate_hashtags returns."""
+    return ", ".join(normalize_hashtags(tags))
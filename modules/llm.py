@@ -0,0 +1,165 @@
+# modules/llm.py
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from modules import replay
+from modules.llm_cache import get_llm_cache, make_cache_key
+from modules.llm_gateway import get_llm_gateway
+from modules.llm_metrics import LLMCallRecord, get_llm_metrics, usage_tokens
+
+T = TypeVar("T")
+
+DEFAULT_MAX_IN_FLIGHT = int(os.environ.get("AURI_LLM_MAX_IN_FLIGHT", "4"))
+DEFAULT_COMPLETION_TOKENS = 1024
+
+def _estimate_request_tokens(messages: List[Dict[str, Any]], kwargs: Dict[str, Any]) -> int:
+    """Rough prompt+completion size used for tokens/min limiting (~4 chars per token)."""
+    chars = sum(len(str(m.get("content") or "")) for m in messages)
+    return chars // 4 + int(kwargs.get("max_tokens") or DEFAULT_COMPLETION_TOKENS)
+
+def chat_completion(client,
+                    messages: List[Dict[str, Any]],
+                    model: str = "gpt-4o",
+                    temperature: float = 0.7,
+                    prompt_version: str = "v1",
+                    use_cache: bool = True,
+                    validate: Optional[Callable[[str], Any]] = None,
+                    deadline: Optional[float] = None,
+                    step: str = "unknown",
+                    **kwargs: Any) -> str:
+    """
+    Run a chat completion and return the stripped message text.
+    Identical requests (same model, messages, temperature, prompt version and
+    extra params) are served from the shared disk cache.
+    If `validate` is given it runs on fresh responses before they are cached;
+    whatever it raises propagates and the response is not stored.
+    Upstream calls go through the shared gateway (coalescing, rate limits,
+    retries); `deadline` caps the whole call in seconds.
+    Every call is recorded in modules.llm_metrics under `step`.
+    """
+    rec = LLMCallRecord(step=step, model=model, started_at=time.time())
+    t0 = time.perf_counter()
+    try:
+        # record/replay must see every request, so the cache sits out
+        cache = get_llm_cache() if use_cache and not replay.active() else None
+        key = make_cache_key(model, messages, temperature, prompt_version, **kwargs)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                rec.cache_hit = True
+                return cached
+
+        sent = []   # stays empty when an identical in-flight request served us
+        def _send(timeout):
+            sent.append(True)
+            return client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                timeout=timeout,
+                **kwargs,
+            )
+
+        response = get_llm_gateway().call(
+            _send,
+            key=key,
+            estimated_tokens=_estimate_request_tokens(messages, kwargs),
+            deadline=deadline,
+        )
+        rec.coalesced = not sent
+        if sent:
+            rec.prompt_tokens, rec.completion_tokens = usage_tokens(getattr(response, "usage", None))
+        content = (response.choices[0].message.content or "").strip()
+        if validate is not None:
+            validate(content)
+        if cache is not None and content:
+            cache.set(key, content)
+        return content
+    except Exception as e:
+        rec.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        rec.wall_time = time.perf_counter() - t0
+        rec.time_to_first_token = rec.wall_time   # non-streaming: first token arrives with the response
+        get_llm_metrics().record(rec)
+
+def stream_chat_completion(client,
+                           messages: List[Dict[str, Any]],
+                           model: str = "gpt-4o",
+                           temperature: float = 0.7,
+                           prompt_version: str = "v1",
+                           use_cache: bool = True,
+                           deadline: Optional[float] = None,
+                           step: str = "unknown",
+                           **kwargs: Any) -> Iterator[str]:
+    """
+    Streaming counterpart of chat_completion: yields text deltas as they arrive.
+    Shares the cache with chat_completion (same key for the same request); a hit
+    is yielded as one chunk, and a completed stream is stored for next time.
+    """
+    rec = LLMCallRecord(step=step, model=model, kind="stream", started_at=time.time())
+    t0 = time.perf_counter()
+    try:
+        # record/replay must see every request, so the cache sits out
+        cache = get_llm_cache() if use_cache and not replay.active() else None
+        key = make_cache_key(model, messages, temperature, prompt_version, **kwargs)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                rec.cache_hit = True
+                rec.time_to_first_token = time.perf_counter() - t0
+                yield cached
+                return
+
+        # Rate limits and retries apply until the stream opens; streams are not coalesced
+        stream = get_llm_gateway().call(
+            lambda timeout: client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                stream=True,
+                stream_options={"include_usage": True},
+                timeout=timeout,
+                **kwargs,
+            ),
+            estimated_tokens=_estimate_request_tokens(messages, kwargs),
+            deadline=deadline,
+        )
+        parts = []
+        for chunk in stream:
+            if getattr(chunk, "usage", None) is not None:
+                rec.prompt_tokens, rec.completion_tokens = usage_tokens(chunk.usage)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                if rec.time_to_first_token is None:
+                    rec.time_to_first_token = time.perf_counter() - t0
+                parts.append(delta)
+                yield delta
+        content = "".join(parts).strip()
+        if cache is not None and content:
+            cache.set(key, content)
+    except Exception as e:
+        rec.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        rec.wall_time = time.perf_counter() - t0
+        get_llm_metrics().record(rec)
+
+def fan_out(calls: Sequence[Callable[[], T]],
+            max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> Iterator[Tuple[int, T]]:
+    """
+    Run zero-argument callables on a bounded thread pool and yield
+    (index, result) as each one finishes. Callers use the index to put results
+    back in their original order; at most `max_in_flight` calls run at once.
+    """
+    if not calls:
+        return
+    workers = max(1, min(int(max_in_flight), len(calls)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="auri-llm") as pool:
+        futures = {pool.submit(fn): i for i, fn in enumerate(calls)}
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
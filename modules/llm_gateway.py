@@ -0,0 +1,185 @@
+# modules/llm_gateway.py
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_REQUESTS_PER_MINUTE = float(os.environ.get("AURI_LLM_RPM", "450"))
+DEFAULT_TOKENS_PER_MINUTE = float(os.environ.get("AURI_LLM_TPM", "150000"))
+DEFAULT_MAX_RETRIES = int(os.environ.get("AURI_LLM_MAX_RETRIES", "5"))
+DEFAULT_DEADLINE_SECONDS = float(os.environ.get("AURI_LLM_DEADLINE", "120"))
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+class DeadlineExceeded(TimeoutError):
+    """The call could not complete (including waits and retries) before its deadline."""
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `rate_per_minute`."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = float(rate_per_minute) / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0, deadline: Optional[float] = None) -> None:
+        """Block until `amount` tokens are available; raise DeadlineExceeded past `deadline` (monotonic)."""
+        amount = min(float(amount), self.capacity)   # oversized requests wait for a full bucket
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate if self.rate > 0 else float("inf")
+            if deadline is not None and now + wait > deadline:
+                raise DeadlineExceeded("rate limit wait would exceed the call deadline")
+            time.sleep(min(wait, 1.0))
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution."""
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if not flight.done.wait(timeout):
+                raise DeadlineExceeded("timed out waiting for an identical in-flight request")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+def _is_retryable(exc: BaseException) -> bool:
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    # openai.APIConnectionError / APITimeoutError carry no status code
+    return type(exc).__name__ in {"APIConnectionError", "APITimeoutError", "ConnectError", "ReadTimeout"}
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            return float(value) / 1000.0
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+class LLMGateway:
+    """
+    Shared front door for LLM traffic:
+      - single-flight: identical in-flight requests share one upstream call
+      - token buckets for requests/min and tokens/min
+      - jittered exponential backoff on 429 / 5xx / connection errors
+      - a per-call deadline covering queueing, retries and the request itself
+    """
+
+    def __init__(self,
+                 requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 base_delay: float = 0.5,
+                 max_delay: float = 20.0,
+                 default_deadline: float = DEFAULT_DEADLINE_SECONDS):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.single_flight = SingleFlight()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.default_deadline = default_deadline
+        self.retries = 0
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (0-based) retry attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self,
+             send: Callable[[float], Any],
+             key: Optional[str] = None,
+             estimated_tokens: int = 0,
+             deadline: Optional[float] = None) -> Any:
+        """
+        Run `send(timeout_seconds)` under rate limits and retries.
+        `key` enables single-flight coalescing (omit it for streaming calls).
+        `deadline` is seconds from now; defaults to `default_deadline`.
+        """
+        budget = self.default_deadline if deadline is None else deadline
+        expires = time.monotonic() + budget
+        run = lambda: self._call_with_retries(send, estimated_tokens, expires)
+        if key is None:
+            return run()
+        return self.single_flight.do(key, run, timeout=budget)
+
+    def _call_with_retries(self, send: Callable[[float], Any], estimated_tokens: int, expires: float) -> Any:
+        attempt = 0
+        while True:
+            self.request_bucket.acquire(1, deadline=expires)
+            if estimated_tokens:
+                self.token_bucket.acquire(estimated_tokens, deadline=expires)
+            remaining = expires - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceeded("LLM call deadline exceeded")
+            try:
+                return send(remaining)
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    raise
+                delay = max(self.backoff(attempt), _retry_after(e) or 0.0)
+                if time.monotonic() + delay >= expires:
+                    raise
+                self.retries += 1
+                attempt += 1
+                time.sleep(delay)
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+def get_llm_gateway() -> LLMGateway:
+    """Process-wide gateway shared by every session and thread."""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = LLMGateway()
+    return _gateway
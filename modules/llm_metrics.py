@@ -0,0 +1,115 @@
+# modules/llm_metrics.py
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, List, Optional
+
+# USD per 1M tokens (input, output) for chat models; USD per image for image models
+CHAT_PRICING: Dict[str, tuple] = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+IMAGE_PRICING: Dict[str, float] = {
+    "dall-e-3": 0.040,   # 1024x1024, standard quality
+}
+
+@dataclass
+class LLMCallRecord:
+    step: str                                   # calling step, e.g. 'script', 'caption'
+    model: str
+    kind: str = "chat"                          # 'chat', 'stream' or 'image'
+    started_at: float = 0.0                     # epoch seconds
+    wall_time: float = 0.0                      # seconds
+    time_to_first_token: Optional[float] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    images: int = 0
+    cache_hit: bool = False
+    coalesced: bool = False                     # served by an identical in-flight request
+    error: str = ""
+
+    @property
+    def cost_usd(self) -> float:
+        if self.cache_hit or self.coalesced:
+            return 0.0
+        if self.kind == "image":
+            return self.images * IMAGE_PRICING.get(self.model, 0.0)
+        price_in, price_out = CHAT_PRICING.get(self.model, (0.0, 0.0))
+        return (self.prompt_tokens * price_in + self.completion_tokens * price_out) / 1_000_000
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = asdict(self)
+        out["cost_usd"] = round(self.cost_usd, 6)
+        return out
+
+class LLMMetrics:
+    """Thread-safe, bounded in-process log of LLM/image calls."""
+
+    def __init__(self, max_records: int = 10000):
+        self._records: deque = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, rec: LLMCallRecord) -> LLMCallRecord:
+        with self._lock:
+            self._records.append(rec)
+        return rec
+
+    def records(self, step: Optional[str] = None) -> List[LLMCallRecord]:
+        with self._lock:
+            recs = list(self._records)
+        return [r for r in recs if step is None or r.step == step]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """One row per step: calls, cache hits, latency, tokens and cost."""
+        rows: Dict[str, Dict[str, Any]] = {}
+        for r in self.records():
+            row = rows.setdefault(r.step, {
+                "step": r.step, "calls": 0, "cache_hits": 0, "errors": 0,
+                "total_time_s": 0.0, "prompt_tokens": 0, "completion_tokens": 0,
+                "cost_usd": 0.0, "_ttft": [],
+            })
+            row["calls"] += 1
+            row["cache_hits"] += int(r.cache_hit)
+            row["errors"] += int(bool(r.error))
+            row["total_time_s"] += r.wall_time
+            row["prompt_tokens"] += r.prompt_tokens
+            row["completion_tokens"] += r.completion_tokens
+            row["cost_usd"] += r.cost_usd
+            if r.time_to_first_token is not None:
+                row["_ttft"].append(r.time_to_first_token)
+        out = []
+        for row in rows.values():
+            ttft = row.pop("_ttft")
+            row["avg_time_s"] = round(row["total_time_s"] / row["calls"], 3)
+            row["avg_ttft_s"] = round(sum(ttft) / len(ttft), 3) if ttft else None
+            row["total_time_s"] = round(row["total_time_s"], 3)
+            row["cost_usd"] = round(row["cost_usd"], 4)
+            out.append(row)
+        return sorted(out, key=lambda r: -r["total_time_s"])
+
+    def to_jsonl(self, records: Optional[Iterable[LLMCallRecord]] = None) -> str:
+        recs = self.records() if records is None else records
+        return "".join(json.dumps(r.to_dict(), ensure_ascii=False) + "\n" for r in recs)
+
+    def export_jsonl(self, path: str) -> int:
+        """Append all records to `path` as JSON lines; returns how many were written."""
+        recs = self.records()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(self.to_jsonl(recs))
+        return len(recs)
+
+def usage_tokens(usage: Any) -> tuple:
+    """(prompt_tokens, completion_tokens) from an OpenAI `usage` object (or None)."""
+    if usage is None:
+        return 0, 0
+    return int(getattr(usage, "prompt_tokens", 0) or 0), int(getattr(usage, "completion_tokens", 0) or 0)
+
+_metrics = LLMMetrics()
+
+def get_llm_metrics() -> LLMMetrics:
+    return _metrics
@@ -0,0 +1,84 @@
+# modules/media_probe.py
+"""
+ffprobe lookups for source clips, memoized per (path, size, mtime) so a
+render touching the same uploads again doesn't re-probe them.
+"""
+import functools
+import json
+import os
+import shutil
+import subprocess
+from typing import Any, Dict, NamedTuple, Optional
+
+FFPROBE = os.environ.get("AURI_FFPROBE", "ffprobe")
+
+class StreamSignature(NamedTuple):
+    """The stream parameters the concat demuxer needs to match across files."""
+    video_codec: str
+    width: int
+    height: int
+    pix_fmt: str
+    frame_rate: str        # ffprobe's r_frame_rate, e.g. '30/1'
+    audio_codec: Optional[str]
+    sample_rate: Optional[int]
+    channels: Optional[int]
+
+def ffprobe_available() -> bool:
+    return shutil.which(FFPROBE) is not None
+
+def _stamp(path: str):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+@functools.lru_cache(maxsize=512)
+def _probe(path: str, stamp) -> Optional[Dict[str, Any]]:
+    try:
+        proc = subprocess.run(
+            [FFPROBE, "-v", "error", "-show_entries",
+             "stream=codec_type,codec_name,width,height,pix_fmt,r_frame_rate,sample_rate,channels",
+             "-of", "json", path],
+            capture_output=True, text=True,
+        )
+    except OSError:
+        return None
+    if proc.returncode != 0:
+        return None
+    try:
+        return json.loads(proc.stdout or "{}")
+    except ValueError:
+        return None
+
+def probe_streams(path: str) -> Optional[Dict[str, Any]]:
+    """ffprobe's stream list as {'streams': [...]}, or None when it can't be read."""
+    try:
+        return _probe(path, _stamp(path))
+    except OSError:
+        return None
+
+def has_audio(path: str) -> Optional[bool]:
+    """Whether the file has an audio stream; None when ffprobe can't tell (missing or failed)."""
+    info = probe_streams(path)
+    if info is None:
+        return None
+    return any(s.get("codec_type") == "audio" for s in info.get("streams", []))
+
+def stream_signature(path: str) -> Optional[StreamSignature]:
+    """Signature of the first video and audio stream; None without ffprobe or a video stream."""
+    info = probe_streams(path)
+    if not info:
+        return None
+    streams = info.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+    if video is None:
+        return None
+    return StreamSignature(
+        video_codec=video.get("codec_name", ""),
+        width=int(video.get("width") or 0),
+        height=int(video.get("height") or 0),
+        pix_fmt=video.get("pix_fmt", ""),
+        frame_rate=video.get("r_frame_rate", ""),
+        audio_codec=audio.get("codec_name") if audio else None,
+        sample_rate=int(audio["sample_rate"]) if audio and audio.get("sample_rate") else None,
+        channels=int(audio["channels"]) if audio and audio.get("channels") else None,
+    )
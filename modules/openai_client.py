@@ -0,0 +1,74 @@
+# modules/openai_client.py
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from modules import replay
+
+DEFAULT_BASE_URL = os.environ.get("AURI_OPENAI_BASE_URL") or None
+DEFAULT_POOL_SIZE = int(os.environ.get("AURI_OPENAI_POOL_SIZE", "20"))
+DEFAULT_TIMEOUT = float(os.environ.get("AURI_OPENAI_TIMEOUT", "60"))
+DEFAULT_CONNECT_TIMEOUT = float(os.environ.get("AURI_OPENAI_CONNECT_TIMEOUT", "10"))
+DEFAULT_KEEPALIVE_EXPIRY = float(os.environ.get("AURI_OPENAI_KEEPALIVE", "60"))
+
+_clients: Dict[Tuple[Any, ...], Any] = {}
+_lock = threading.Lock()
+
+def _default_api_key() -> str:
+    if os.environ.get("OPENAI_API_KEY"):
+        return os.environ["OPENAI_API_KEY"]
+    import streamlit as st
+    return st.secrets["openai"]["api_key"]
+
+def get_openai_client(api_key: Optional[str] = None,
+                      base_url: Optional[str] = DEFAULT_BASE_URL,
+                      pool_size: int = DEFAULT_POOL_SIZE,
+                      timeout: float = DEFAULT_TIMEOUT,
+                      connect_timeout: float = DEFAULT_CONNECT_TIMEOUT):
+    """
+    Return the long-lived OpenAI client for this configuration, creating it once.
+    Clients share a keep-alive httpx pool, so repeated calls reuse warm
+    connections instead of paying a new TCP/TLS handshake each time.
+    The OpenAI client is thread-safe; one instance serves every session.
+    In replay mode (modules.replay) a fixture-backed stand-in is returned
+    instead, and in record mode the pooled client is wrapped to save responses.
+    """
+    if replay.mode() == replay.REPLAY:
+        return replay.ReplayOpenAIClient()
+
+    key = api_key or _default_api_key()
+    reg_key = (key, base_url, pool_size, timeout, connect_timeout)
+    client = _clients.get(reg_key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(reg_key)
+        if client is None:
+            import httpx
+            from openai import OpenAI
+
+            http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=pool_size,
+                    keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            )
+            # Retries/backoff are owned by modules.llm_gateway, not the SDK
+            client = OpenAI(api_key=key, base_url=base_url, http_client=http_client, max_retries=0)
+            _clients[reg_key] = client
+    if replay.mode() == replay.RECORD:
+        return replay.ReplayOpenAIClient(client)
+    return client
+
+def close_openai_clients() -> None:
+    """Close every pooled client (e.g. at interpreter shutdown or in benchmarks)."""
+    with _lock:
+        for client in _clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        _clients.clear()
@@ -0,0 +1,114 @@
+# modules/prompt_budget.py
+import logging
+import math
+import re
+from typing import Dict, Optional
+
+logger = logging.getLogger("auri.prompt_budget")
+
+# Token budget for the user-supplied fields of each prompt template
+# (the fixed instruction text is not counted).
+TEMPLATE_BUDGETS: Dict[str, int] = {
+    "script": 3000,
+    "caption": 1500,
+    "hashtags": 1200,
+    "caption_hashtags": 1500,
+}
+
+TRIM_MARKER = "\n[…trimmed…]\n"
+
+_piece_re = re.compile(r"\w+|[^\w\s]")
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    Local, dependency-free token estimate: words count as ~4 chars per token,
+    every punctuation mark / emoji as one. Close enough to tiktoken for budgeting.
+    """
+    if not text:
+        return 0
+    return sum(math.ceil(len(p) / 4) if p[0].isalnum() or p[0] == "_" else 1
+               for p in _piece_re.findall(text))
+
+_MARKER_TOKENS = estimate_tokens(TRIM_MARKER)
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Deterministically cut `text` to about `max_tokens`: keep the head (2/3)
+    and the tail (1/3), snapped to line breaks when possible, joined by TRIM_MARKER.
+    Budgets too small for the marker plus some text get a plain prefix instead.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    if max_tokens <= _MARKER_TOKENS:
+        return _prefix(text, max_tokens)
+    # token estimate is roughly proportional to length; scale chars, then
+    # tighten until the result (marker included) fits
+    ratio = max_tokens / max(1, estimate_tokens(text))
+    keep = max(1, int(len(text) * ratio) - len(TRIM_MARKER))
+    while True:
+        out = _head_tail(text, keep)
+        if estimate_tokens(out) <= max_tokens:
+            return out
+        if keep <= 1:
+            return _prefix(text, max_tokens)
+        keep = int(keep * 0.95)
+
+def _prefix(text: str, max_tokens: int) -> str:
+    """Longest prefix of `text` whose estimate fits `max_tokens` (binary search on length)."""
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo].rstrip()
+
+def _head_tail(text: str, keep: int) -> str:
+    head_len = (keep * 2) // 3
+    tail_len = keep - head_len
+
+    head = text[:head_len]
+    cut = head.rfind("\n")
+    if cut > head_len // 2:
+        head = head[:cut]
+    tail = text[len(text) - tail_len:] if tail_len else ""
+    cut = tail.find("\n")
+    if 0 <= cut < tail_len // 2:
+        tail = tail[cut + 1:]
+    return head.rstrip() + TRIM_MARKER + tail.lstrip()
+
+def fit_fields(template: str,
+               fields: Dict[str, Optional[str]],
+               budget: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """
+    Shrink the given prompt fields so their combined estimate fits the
+    template's budget. Small fields are kept whole; the remaining budget is
+    shared evenly among the larger ones (water-filling), which are truncated.
+    Logs how many tokens were trimmed per field.
+    """
+    budget = TEMPLATE_BUDGETS.get(template, 2000) if budget is None else budget
+    sizes = {name: estimate_tokens(value) for name, value in fields.items()}
+    if sum(sizes.values()) <= budget:
+        return dict(fields)
+
+    allowance: Dict[str, int] = {}
+    remaining = budget
+    pending = sorted(sizes, key=lambda name: (sizes[name], name))
+    while pending:
+        share = remaining // len(pending)
+        name = pending.pop(0)
+        allowance[name] = min(sizes[name], share)
+        remaining -= allowance[name]
+
+    out: Dict[str, Optional[str]] = {}
+    for name, value in fields.items():
+        if value and sizes[name] > allowance[name]:
+            out[name] = truncate_to_tokens(value, allowance[name])
+            logger.info("%s prompt: trimmed '%s' from ~%d to ~%d tokens (budget %d)",
+                        template, name, sizes[name], estimate_tokens(out[name]), budget)
+        else:
+            out[name] = value
+    return out
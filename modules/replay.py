@@ -0,0 +1,184 @@
+# modules/replay.py
+"""
+Record/replay of external calls (OpenAI chat + images, gTTS audio, Supabase
+inserts) so the content pipeline can run offline and deterministically.
+
+    AURI_REPLAY_MODE=record  AURI_REPLAY_DIR=fixtures/replay  → call services, save responses
+    AURI_REPLAY_MODE=replay  AURI_REPLAY_DIR=fixtures/replay  → serve saved responses, no network
+
+In replay mode a missing fixture raises ReplayMissError instead of going online.
+"""
+import hashlib
+import json
+import os
+import threading
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+OFF, RECORD, REPLAY = "off", "record", "replay"
+
+_state = {
+    "mode": os.environ.get("AURI_REPLAY_MODE", OFF).lower(),
+    "dir": os.environ.get("AURI_REPLAY_DIR", os.path.join("fixtures", "replay")),
+}
+_write_lock = threading.Lock()
+
+class ReplayMissError(LookupError):
+    """Replay mode asked for a response that was never recorded."""
+
+def configure(mode: str, fixture_dir: Optional[str] = None) -> None:
+    """Switch mode at runtime (benchmarks/tests); env vars set the default."""
+    if mode not in (OFF, RECORD, REPLAY):
+        raise ValueError(f"unknown replay mode: {mode!r}")
+    _state["mode"] = mode
+    if fixture_dir:
+        _state["dir"] = fixture_dir
+
+def mode() -> str:
+    return _state["mode"]
+
+def active() -> bool:
+    return _state["mode"] in (RECORD, REPLAY)
+
+def fixture_key(kind: str, payload: Dict[str, Any]) -> str:
+    blob = json.dumps({"kind": kind, **payload}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+def _fixture_path(kind: str, key: str, ext: str) -> str:
+    return os.path.join(_state["dir"], kind, f"{key}.{ext}")
+
+def _load_json(kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    path = _fixture_path(kind, fixture_key(kind, payload), "json")
+    if not os.path.exists(path):
+        raise ReplayMissError(f"no recorded {kind} response at {path}")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _save_json(kind: str, payload: Dict[str, Any], data: Dict[str, Any]) -> None:
+    path = _fixture_path(kind, fixture_key(kind, payload), "json")
+    with _write_lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"request": payload, **data}, f, ensure_ascii=False, indent=2, default=str)
+
+# ---------- OpenAI ----------
+
+def _chat_payload(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    # streaming and non-streaming share fixtures; transport-only params are ignored
+    ignored = {"stream", "stream_options", "timeout"}
+    return {k: v for k, v in kwargs.items() if k not in ignored}
+
+def _usage_dict(usage: Any) -> Optional[Dict[str, int]]:
+    if usage is None:
+        return None
+    return {"prompt_tokens": int(getattr(usage, "prompt_tokens", 0) or 0),
+            "completion_tokens": int(getattr(usage, "completion_tokens", 0) or 0)}
+
+def _completion(content: str, usage: Optional[Dict[str, int]]) -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(role="assistant", content=content),
+                                 finish_reason="stop")],
+        usage=SimpleNamespace(**usage) if usage else None,
+    )
+
+def _stream_chunks(content: str, usage: Optional[Dict[str, int]], chunk_size: int = 24) -> Iterator[SimpleNamespace]:
+    for i in range(0, len(content), chunk_size):
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content[i:i + chunk_size]))],
+                              usage=None)
+    yield SimpleNamespace(choices=[], usage=SimpleNamespace(**usage) if usage else None)
+
+class _Completions:
+    def __init__(self, inner):
+        self._inner = inner
+
+    def create(self, **kwargs):
+        payload = _chat_payload(kwargs)
+        if mode() == REPLAY:
+            data = _load_json("chat", payload)
+            if kwargs.get("stream"):
+                return _stream_chunks(data["content"], data.get("usage"))
+            return _completion(data["content"], data.get("usage"))
+
+        response = self._inner.chat.completions.create(**kwargs)
+        if not kwargs.get("stream"):
+            _save_json("chat", payload, {"content": response.choices[0].message.content or "",
+                                         "usage": _usage_dict(getattr(response, "usage", None))})
+            return response
+        return self._record_stream(payload, response)
+
+    def _record_stream(self, payload, stream):
+        parts: List[str] = []
+        usage = None
+        for chunk in stream:
+            if getattr(chunk, "usage", None) is not None:
+                usage = _usage_dict(chunk.usage)
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+            yield chunk
+        _save_json("chat", payload, {"content": "".join(parts), "usage": usage})
+
+class _Images:
+    def __init__(self, inner):
+        self._inner = inner
+
+    def generate(self, **kwargs):
+        payload = _chat_payload(kwargs)
+        if mode() == REPLAY:
+            data = _load_json("image", payload)
+            return SimpleNamespace(data=[SimpleNamespace(url=u) for u in data["urls"]])
+        response = self._inner.images.generate(**kwargs)
+        _save_json("image", payload, {"urls": [d.url for d in response.data]})
+        return response
+
+class ReplayOpenAIClient:
+    """
+    Stand-in for openai.OpenAI exposing chat.completions.create and
+    images.generate. Records through `inner` in record mode; in replay mode
+    `inner` may be None and no network is touched.
+    """
+
+    def __init__(self, inner=None):
+        self._inner = inner
+        self.chat = SimpleNamespace(completions=_Completions(inner))
+        self.images = _Images(inner)
+
+    def close(self) -> None:
+        if self._inner is not None:
+            self._inner.close()
+
+# ---------- Generic (TTS bytes, Supabase inserts) ----------
+
+def replay_bytes(kind: str, payload: Dict[str, Any], produce: Callable[[], bytes], ext: str = "bin") -> bytes:
+    """Record or replay a binary response (e.g. synthesized audio)."""
+    if not active():
+        return produce()
+    path = _fixture_path(kind, fixture_key(kind, payload), ext)
+    if mode() == REPLAY:
+        if not os.path.exists(path):
+            raise ReplayMissError(f"no recorded {kind} bytes at {path}")
+        with open(path, "rb") as f:
+            return f.read()
+    data = produce()
+    with _write_lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    return data
+
+def replay_insert(table: str, row: Dict[str, Any], insert: Callable[[], Any]) -> Any:
+    """
+    Record or replay a Supabase insert. Rows carry timestamps, so recorded
+    inserts are appended to <dir>/supabase/<table>.jsonl rather than keyed by
+    content; in replay mode the row is echoed back without contacting Supabase.
+    """
+    if not active():
+        return insert()
+    if mode() == REPLAY:
+        return SimpleNamespace(data=[row])
+    result = insert()
+    path = os.path.join(_state["dir"], "supabase", f"{table}.jsonl")
+    with _write_lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+    return result
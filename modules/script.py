@@ -1,12 +1,23 @@
-from openai import OpenAI
-import streamlit as st
 import re
-
-def generate_script(goal, user_input=None, previous_output=None, user_instruction=None, platform="TikTok", tone="Informative"):
-
-    client = OpenAI(api_key=st.secrets["openai"]["api_key"])
-
-    prompt = f"""
+from modules.llm import chat_completion, stream_chat_completion
+from modules.openai_client import get_openai_client
+from modules.prompt_budget import fit_fields
+
+SCRIPT_PROMPT_VERSION = "script-v1"
+SCRIPT_STEP_PROMPT_VERSION = "script-step-v1"
+
+def _build_script_prompt(goal, user_input=None, previous_output=None, user_instruction=None, platform="TikTok", tone="Informative"):
+    # Long repurposing inputs (tweets, blogs, previous steps) are trimmed to the template budget
+    fields = fit_fields("script", {
+        "goal": goal,
+        "user_instruction": user_instruction,
+        "user_input": user_input,
+        "previous_output": previous_output,
+    })
+    goal, user_instruction = fields["goal"], fields["user_instruction"]
+    user_input, previous_output = fields["user_input"], fields["previous_output"]
+
+    return f"""
     You are Auri, an expert short-form content director and social media scriptwriter.
 
     🧠 The user's overall goal:
@@ -61,13 +72,34 @@ def generate_script(goal, user_input=None, previous_output=None, user_instructio
     """
 
 
-    response = client.chat.completions.create(
-        model="gpt-4o",
+def generate_script(goal, user_input=None, previous_output=None, user_instruction=None, platform="TikTok", tone="Informative"):
+
+    client = get_openai_client()
+    prompt = _build_script_prompt(goal, user_input, previous_output, user_instruction, platform, tone)
+
+    return chat_completion(
+        client,
         messages=[{"role": "user", "content": prompt}],
+        model="gpt-4o",
         temperature=0.7,
+        prompt_version=SCRIPT_PROMPT_VERSION,
+        step="script",
     )
 
-    return response.choices[0].message.content.strip()
+
+def stream_script(goal, user_input=None, previous_output=None, user_instruction=None, platform="TikTok", tone="Informative"):
+    """Same request as generate_script, but yields the markdown in chunks as it is generated."""
+    client = get_openai_client()
+    prompt = _build_script_prompt(goal, user_input, previous_output, user_instruction, platform, tone)
+
+    yield from stream_chat_completion(
+        client,
+        messages=[{"role": "user", "content": prompt}],
+        model="gpt-4o",
+        temperature=0.7,
+        prompt_version=SCRIPT_PROMPT_VERSION,
+        step="script",
+    )
 
 
 def generate_script_step_instruction(client, idea_text, platform="Instagram", tone="Informative"):
@@ -86,12 +118,14 @@ def generate_script_step_instruction(client, idea_text, platform="Instagram", to
         Only generate that one line. Keep it clean and clear.
         """
 
-    response = client.chat.completions.create(
-        model="gpt-4o",
+    line = chat_completion(
+        client,
         messages=[{"role": "user", "content": micro_prompt}],
+        model="gpt-4o",
         temperature=0.3,
+        prompt_version=SCRIPT_STEP_PROMPT_VERSION,
+        step="script_step",
     )
-    line = response.choices[0].message.content.strip()
     match = re.match(r"^\s*Script Writing\s+\|\s+(I will.*?)\s+\|\s+(To do that.*?)$", line)
     if match:
         return {
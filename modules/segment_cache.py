@@ -0,0 +1,124 @@
+# modules/segment_cache.py
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from modules.llm_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_SEGMENT_DIR = os.path.join(DEFAULT_CACHE_DIR, "segments")
+DEFAULT_MAX_BYTES = int(os.environ.get("AURI_SEGMENT_CACHE_MAX_BYTES", str(4 * 1024 ** 3)))
+
+class SegmentCache:
+    """
+    Directory of rendered scene segments named by content key (<key>.mp4).
+    A hit refreshes the file's mtime; after each store the least recently used
+    segments are deleted until the total size fits in `max_bytes`. State lives
+    on disk, so Streamlit sessions and worker processes share one cache.
+    """
+
+    def __init__(self, directory: str = DEFAULT_SEGMENT_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 suffix: str = ".mp4"):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max(0, int(max_bytes))
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, key: str) -> Optional[str]:
+        """Path of the cached segment for `key`, or None."""
+        path = self.path_for(key)
+        try:
+            now = time.time()
+            os.utime(path, (now, now))   # mark as recently used
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def put(self, key: str, rendered_path: str, pinned: Iterable[str] = ()) -> str:
+        """
+        Move a freshly rendered file into the cache and evict down to max_bytes,
+        never deleting it or the `pinned` paths (segments of the render in progress).
+        """
+        path = self.path_for(key)
+        os.replace(rendered_path, path)
+        self.evict(pinned={path, *pinned})
+        return path
+
+    def tmp_path(self, key: str) -> str:
+        """Where to render `key` before put(); unique per process and thread."""
+        return os.path.join(self.directory, f".{key}.{os.getpid()}.{threading.get_ident()}.tmp{self.suffix}")
+
+    def evict(self, pinned: Iterable[str] = ()) -> int:
+        """Delete least recently used segments until the cache fits; returns bytes freed."""
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(self.suffix) or entry.name.startswith("."):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+            pinned = set(pinned)
+            freed = 0
+            for _, size, path in sorted(entries):
+                if total - freed <= self.max_bytes:
+                    break
+                if path in pinned:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                freed += size
+            return freed
+
+    def total_bytes(self) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(self.directory)
+                   if entry.name.endswith(self.suffix) and not entry.name.startswith("."))
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(self.suffix):
+                    os.remove(entry.path)
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            hits, misses = self.hits, self.misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / total) if total else 0.0,
+            "bytes": self.total_bytes(),
+            "max_bytes": self.max_bytes,
+        }
+
+_cache: Optional[SegmentCache] = None
+_cache_lock = threading.Lock()
+
+def get_segment_cache() -> SegmentCache:
+    """Process-wide segment cache (lazily created under DEFAULT_SEGMENT_DIR)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SegmentCache()
+    return _cache
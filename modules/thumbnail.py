@@ -1,10 +1,13 @@
-from PIL import Image, ImageDraw, ImageFont
-import requests
+import time
+from modules.llm_metrics import LLMCallRecord, get_llm_metrics
+from modules.openai_client import get_openai_client
 
 def create_thumbnail(base_image_path, title, subtitle="", config=None, output_path="thumbnail.jpg"):
     if config is None:
         raise ValueError("Config must be provided.")
 
+    from PIL import Image, ImageDraw, ImageFont
+
     # Load image
     image = Image.open(base_image_path).convert("RGBA")
 
@@ -110,10 +113,33 @@ def generate_thumbnail_prompt(
 
     return prompt
 
+def generate_ai_image(prompt: str, model: str = "dall-e-3", size: str = "1024x1024") -> str:
+    """
+    Generate one image from `prompt` and return its URL (call is recorded in llm_metrics).
+    """
+    rec = LLMCallRecord(step="thumbnail_image", model=model, kind="image", started_at=time.time())
+    t0 = time.perf_counter()
+    try:
+        response = get_openai_client().images.generate(
+            model=model,
+            prompt=prompt,
+            n=1,
+            size=size
+        )
+        rec.images = len(response.data)
+        return response.data[0].url
+    except Exception as e:
+        rec.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        rec.wall_time = time.perf_counter() - t0
+        get_llm_metrics().record(rec)
+
 def download_image(url: str, save_path: str) -> None:
     """
     Download an image from a URL to a local file.
     """
+    import requests
     response = requests.get(url)
     response.raise_for_status()
     with open(save_path, "wb") as f:
@@ -0,0 +1,180 @@
+# modules/timeline.py
+"""
+Sorted interval index over scene timings.
+
+Scenes come from analyze_script (script time) or an assembly plan (rendered
+output time). The index answers "what plays at t" and "what overlaps [a, b)"
+with a binary search instead of scanning the plan, and reports gaps and
+overlaps in the generated timestamps.
+"""
+import bisect
+import heapq
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 12s, 1.5s, 75 (bare seconds), 1:15, 01:15.5, 1:02:03
+_timestamp_re = re.compile(r'^\s*(?:(\d+):)?(?:(\d+):)?(\d+(?:\.\d+)?)\s*s?\s*$', re.I)
+
+# A script time range: "12s–15s", "1.5s - 3s", "0:05–0:12", or the tight "0–5s".
+# Seconds carry an "s" (a bare start only right before the dash, so
+# "Scene 1 – 0s–5s" still picks the real range) and may appear anywhere in a
+# line. Unit-less mm:ss ranges only count at the start of a line, after an
+# optional "⏱"/"Scene 2 (" style header, so "open 9:00-17:00" in narration
+# isn't read as a scene.
+_TS = r'\d+:[0-5]\d(?::[0-5]\d)?(?:\.\d+)?'
+_SECS = r'\d+(?:\.\d+)?'
+_HEADER = r'[^\w✅"“]*(?:scene\s*\d+[^\w✅"“]*)?'
+time_range_re = re.compile(
+    rf'^{_HEADER}(?P<clock_start>{_TS})\s*[–-]\s*(?P<clock_end>{_TS})s?'
+    rf'|(?:(?P<start>{_TS}|{_SECS}s)\s*[–-]\s*|(?P<bare>{_SECS})[–-])(?P<end>{_TS}s|{_SECS}s)',
+    re.I | re.M,
+)
+
+def parse_timestamp(text: str) -> float:
+    """Seconds from '12', '12s', '1.5s', '1:15', '01:15.5' or '1:02:03'; '1:75' is rejected."""
+    plain = (text or "").strip().rstrip("sS").rstrip()
+    if plain.replace(".", "", 1).isdigit():   # fast path for the common '12s' form
+        return float(plain)
+    m = _timestamp_re.match(text or "")
+    if not m:
+        raise ValueError(f"not a timestamp: {text!r}")
+    hours, minutes, seconds = m.group(1), m.group(2), m.group(3)
+    if hours is not None and minutes is None:   # 'mm:ss' matched the first group
+        hours, minutes = None, hours
+    if (minutes is not None and float(seconds) >= 60) or (hours is not None and int(minutes) >= 60):
+        raise ValueError(f"not a timestamp: {text!r}")
+    return int(hours or 0) * 3600 + int(minutes or 0) * 60 + float(seconds)
+
+def parse_time_range(match: re.Match) -> Tuple[float, float]:
+    """(start, end) seconds from a time_range_re match."""
+    if match.group("clock_start"):
+        return parse_timestamp(match.group("clock_start")), parse_timestamp(match.group("clock_end"))
+    return parse_timestamp(match.group("start") or match.group("bare")), parse_timestamp(match.group("end"))
+
+def whole(value: float):
+    """int for whole numbers (keeps '12s' rather than '12.0s'), else the float."""
+    return int(value) if float(value).is_integer() else value
+
+def format_timestamp(seconds: float) -> str:
+    """m:ss (with tenths when fractional), e.g. 75 -> '1:15', 3.5 -> '0:03.5'."""
+    minutes, secs = divmod(float(seconds), 60)
+    secs_text = f"{secs:04.1f}" if not secs.is_integer() else f"{int(secs):02d}"
+    return f"{int(minutes)}:{secs_text}"
+
+@dataclass(frozen=True)
+class Interval:
+    start: float
+    end: float
+    item: Any = None
+
+class TimelineIndex:
+    """
+    Intervals sorted by start, over a static binary tree holding the max end
+    time of each subtree. A query only descends into subtrees that can reach
+    its start, so it costs O(log n) plus O(log n) per result even when a long
+    interval overlaps many short ones. Intervals are half-open: [start, end).
+    """
+
+    def __init__(self, intervals: Iterable[Interval]):
+        self.intervals: List[Interval] = sorted(intervals, key=lambda iv: (iv.start, iv.end))
+        self._starts = [iv.start for iv in self.intervals]
+        size = 1
+        while size < len(self.intervals):
+            size *= 2
+        self._size = size
+        # heap layout: node i covers children 2i and 2i+1, leaves start at `size`
+        tree = [float("-inf")] * (2 * size)
+        for i, iv in enumerate(self.intervals):
+            tree[size + i] = iv.end
+        for i in range(size - 1, 0, -1):
+            tree[i] = max(tree[2 * i], tree[2 * i + 1])
+        self._max_end = tree
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    @property
+    def end(self) -> float:
+        return self._max_end[1] if self.intervals else 0.0
+
+    def overlapping(self, start: float, end: float) -> List[Interval]:
+        """Intervals intersecting [start, end), in start order."""
+        hi = bisect.bisect_left(self._starts, end) if end > start else bisect.bisect_right(self._starts, start)
+        out: List[Interval] = []
+        tree, size = self._max_end, self._size
+        stack = [(1, 0, size)]   # (node, first leaf, leaf count)
+        while stack:
+            node, lo, width = stack.pop()
+            if lo >= hi or tree[node] <= start:
+                continue   # past the candidates, or nothing below reaches `start`
+            if node >= size:
+                out.append(self.intervals[lo])
+                continue
+            half = width // 2
+            stack.append((2 * node + 1, lo + half, half))
+            stack.append((2 * node, lo, half))   # left first: results come out in start order
+        return out
+
+    def at(self, t: float) -> List[Interval]:
+        """Intervals playing at time t."""
+        return self.overlapping(t, t)
+
+    def first_at(self, t: float) -> Optional[Interval]:
+        hits = self.at(t)
+        return hits[0] if hits else None
+
+    def gaps(self, start: float = 0.0) -> List[Tuple[float, float]]:
+        """Uncovered stretches between `start` and the last interval's end."""
+        out: List[Tuple[float, float]] = []
+        covered = start
+        for iv in self.intervals:
+            if iv.start > covered:
+                out.append((covered, iv.start))
+            covered = max(covered, iv.end)
+        return out
+
+    def overlaps(self) -> List[Tuple[Interval, Interval]]:
+        """Every pair (earlier, later) where the later interval starts before the earlier one ends."""
+        out: List[Tuple[Interval, Interval]] = []
+        active: List[Tuple[float, int, Interval]] = []   # heap of (end, position, interval) still open
+        for n, iv in enumerate(self.intervals):
+            while active and active[0][0] <= iv.start:
+                heapq.heappop(active)
+            out.extend((a, iv) for _, _, a in sorted(active, key=lambda entry: entry[1]))
+            heapq.heappush(active, (iv.end, n, iv))
+        return out
+
+def scene_index(scenes: Iterable[Dict[str, Any]]) -> TimelineIndex:
+    """Index analyze_script scenes by their script timestamps; item is the scene."""
+    return TimelineIndex(
+        Interval(float(sc.get("start_seconds", 0)), float(sc.get("end_seconds", 0)), sc)
+        for sc in scenes
+    )
+
+def output_index(assembly_plan: Iterable[Dict[str, Any]]) -> TimelineIndex:
+    """
+    Index assembly-plan items by where they land in the rendered video: each
+    item's trimmed duration divided by its speed, laid end to end in plan order.
+    """
+    intervals = []
+    t = 0.0
+    for item in assembly_plan:
+        start = float(item.get("start_seconds", 0.0))
+        end = float(item.get("end_seconds", start + 1.0))
+        duration = max(0.0, end - start) / max(0.1, float(item.get("speed", 1.0) or 1.0))
+        intervals.append(Interval(t, t + duration, item))
+        t += duration
+    return TimelineIndex(intervals)
+
+def timeline_report(scenes: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Gaps and overlaps in a script's generated timestamps (1-based scene numbers)."""
+    scenes = list(scenes)
+    position = {id(sc): n for n, sc in enumerate(scenes, start=1)}
+    index = scene_index(scenes)
+    return {
+        "duration": index.end,
+        "gaps": index.gaps(),
+        "overlaps": [(position[id(a.item)], position[id(b.item)], b.start, min(a.end, b.end))
+                     for a, b in index.overlaps()],
+    }
@@ -1,19 +1,33 @@
 
-from gtts import gTTS
-try:
-    from TTS.api import TTS
-except ImportError:
-    TTS = None
+import io
+
+from modules.replay import replay_bytes
+
+# gTTS and Coqui TTS (which pulls in torch) are imported on first use,
+# so importing this module stays cheap.
+
+def synthesize_speech(text, lang="en"):
+    """
+    MP3 bytes for `text` via gTTS (recorded/replayed under modules.replay).
+    """
+    def produce():
+        from gtts import gTTS
+        buf = io.BytesIO()
+        gTTS(text, lang=lang).write_to_fp(buf)
+        return buf.getvalue()
+    return replay_bytes("tts", {"text": text, "lang": lang}, produce, ext="mp3")
 
 def generate_voiceover_fallback(text, output_path):
-    tts = gTTS(text, lang="en")
-    tts.save(output_path)
+    with open(output_path, "wb") as f:
+        f.write(synthesize_speech(text))
 
 def generate_voiceover_coqui(text, output_path):
     """
     Generate TTS audio using Coqui TTS locally.
     """
-    if TTS is None:
+    try:
+        from TTS.api import TTS
+    except ImportError:
         raise ImportError("Coqui TTS is not installed. Please install the 'TTS' package.")
     try:
         tts = TTS(model_name="tts_models/en/vctk/vits", progress_bar=False, gpu=False)
@@ -1,31 +1,404 @@
 # modules/video_editor.py
+import hashlib
+import json
+import logging
 import os
-from typing import List, Dict, Any, Tuple
-from .video import apply_edit_commands, parse_nl_edit_request, compile_ffmpeg_script, render_with_moviepy
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import asdict
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple
+from . import media_probe
+from .ffmpeg_runner import FFMPEG, FFmpegError, ProgressCallback, ffmpeg_available, run_commands, run_ffmpeg
+from .segment_cache import SegmentCache, get_segment_cache
+from .video import (FINAL_PROFILE, OutputProfile, apply_edit_commands, edit_globals, parse_nl_edit_request,
+                    compile_ffmpeg_script, ffmpeg_commands, filter_quote, remove_work_files,
+                    render_with_moviepy)
 
-def assemble_video(assembly_plan: List[Dict[str, Any]],
+logger = logging.getLogger("auri.video_editor")
+
+# scenes encoded at once; 0 = one per CPU core
+DEFAULT_RENDER_WORKERS = int(os.environ.get("AURI_RENDER_WORKERS", "0"))
+# share of the progress bar spent encoding segments; the concat gets the rest
+_SEGMENT_SHARE = 95.0
+
+def segment_seconds(item: Dict[str, Any]) -> float:
+    """Length of an item's rendered segment (trimmed duration over speed)."""
+    ss = max(0.0, float(item.get("start_seconds", 0.0)))
+    ee = max(ss + 0.1, float(item.get("end_seconds", ss + 1.0)))
+    return (ee - ss) / float(item.get("speed", 1.0) or 1.0)
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left before `deadline` (a time.monotonic() value); raises once it has passed."""
+    if deadline is None:
+        return None
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise FFmpegError("timeout", "render timed out")
+    return left
+
+def _moviepy_logger(on_progress: Optional[ProgressCallback],
+                    cancel: Optional[threading.Event],
+                    deadline: Optional[float]) -> Any:
+    """
+    proglog logger for a moviepy write: reports the frame bar to `on_progress`
+    and stops the write with FFmpegError once `cancel` is set or `deadline`
+    passes. "bar" (moviepy's default) when there is nothing to watch.
+    """
+    if on_progress is None and cancel is None and deadline is None:
+        return "bar"
+    try:
+        from proglog import ProgressBarLogger   # ships with moviepy
+    except ImportError:
+        return "bar"
+
+    class _Watch(ProgressBarLogger):
+        def bars_callback(self, bar, attr, value, old_value=None):
+            if cancel is not None and cancel.is_set():
+                raise FFmpegError("cancelled", "render cancelled")
+            _remaining(deadline)
+            if on_progress is not None and bar == "t" and attr == "index":
+                total = self.bars[bar].get("total")
+                if total:
+                    on_progress(min(99.9, 100.0 * value / total))
+
+    return _Watch()
+
+def segment_key(item: Dict[str, Any], source_path: str, profile: OutputProfile) -> str:
+    """
+    Content address of one rendered scene: the source file (path, size and
+    mtime rather than a hash of a possibly multi-GB upload), the item's
+    trim/speed/zoom/caption and the output profile.
+    """
+    st = os.stat(source_path)
+    payload = {
+        "source": [os.path.abspath(source_path), st.st_size, st.st_mtime_ns],
+        "start": float(item.get("start_seconds", 0.0)),
+        "end": float(item.get("end_seconds", float(item.get("start_seconds", 0.0)) + 1.0)),
+        "speed": float(item.get("speed", 1.0) or 1.0),
+        "zoom": item.get("zoom"),
+        "caption": item.get("caption"),
+        "profile": asdict(profile),
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+def segment_command(item: Dict[str, Any],
+                    source_path: str,
+                    out_path: str,
+                    profile: OutputProfile,
+                    has_audio: Optional[bool] = True,
+                    caption_file: Optional[str] = None,
+                    threads: int = 0) -> List[str]:
+    """
+    ffmpeg argv that renders one assembly item to a normalized segment
+    (threads=0: ffmpeg decides). has_audio=False pairs the video with a
+    silent track; None (unprobed) maps the source's audio when it has any.
+    """
+    ss = max(0.0, float(item.get("start_seconds", 0.0)))
+    ee = max(ss + 0.1, float(item.get("end_seconds", ss + 1.0)))
+    spd = float(item.get("speed", 1.0) or 1.0)
+    args = [FFMPEG, "-y", "-v", "error", "-ss", f"{ss:.3f}", "-t", f"{ee - ss:.3f}", "-i", source_path]
+    if has_audio is False:
+        args += ["-f", "lavfi", "-t", f"{segment_seconds(item):.3f}",
+                 "-i", f"anullsrc=r={profile.audio_rate}:cl=stereo"]
+
+    v = []
+    if spd != 1.0:
+        v.append(f"setpts=PTS/{spd:.4f}")
+    if item.get("zoom") == "in":
+        v.append("scale=iw*1.1:ih*1.1,crop=iw/1.1:ih/1.1")
+    w, h = profile.width, profile.height
+    v.append(f"scale={w}:{h}:force_original_aspect_ratio=decrease,pad={w}:{h}:(ow-iw)/2:(oh-ih)/2,setsar=1")
+    if caption_file:
+        # text comes from a file, so quotes and colons in captions need no escaping
+        v.append(f"drawtext=textfile={filter_quote(caption_file)}:x=(w-text_w)/2:y=h-100"
+                 ":fontsize=42:fontcolor=white:box=1:boxcolor=black@0.5")
+    v.append(f"fps={profile.fps},format=yuv420p")
+
+    a = []
+    if spd != 1.0 and has_audio is not False:   # the silent track is generated at output length
+        remain = spd
+        while remain > 2.0 + 1e-6:
+            a.append("atempo=2.0")
+            remain /= 2.0
+        while remain < 0.5 - 1e-6:
+            a.append("atempo=0.5")
+            remain /= 0.5
+        a.append(f"atempo={remain:.4f}")
+    a.append(f"aresample={profile.audio_rate},aformat=channel_layouts=stereo")
+
+    audio_map = {True: "0:a:0", False: "1:a:0"}.get(has_audio, "0:a:0?")
+    args += ["-map", "0:v:0", "-map", audio_map,
+             "-vf", ",".join(v), "-af", ",".join(a),
+             "-c:v", "libx264", "-preset", profile.preset, "-crf", str(profile.crf),
+             "-c:a", "aac", "-b:a", "128k", "-ar", str(profile.audio_rate), "-ac", "2",
+             "-video_track_timescale", "90000", "-shortest"]
+    if threads:
+        args += ["-threads", str(threads)]
+    args.append(out_path)
+    return args
+
+def render_segment(item: Dict[str, Any],
+                   source_path: str,
+                   profile: OutputProfile,
+                   cache: SegmentCache,
+                   pinned: Iterable[str] = (),
+                   threads: int = 0,
+                   on_progress: Optional[ProgressCallback] = None,
+                   cancel: Optional[threading.Event] = None,
+                   timeout: Optional[float] = None) -> Tuple[str, bool]:
+    """
+    (segment path, reused) for one item, rendering it only on a cache miss.
+    `on_progress`, `cancel` and `timeout` go to ffmpeg_runner.run_ffmpeg.
+    """
+    key = segment_key(item, source_path, profile)
+    cached = cache.get(key)
+    if cached:
+        return cached, True
+    tmp = cache.tmp_path(key)
+    caption_file = None
+    if item.get("caption"):
+        caption_file = tmp + ".txt"
+        with open(caption_file, "w", encoding="utf-8") as f:
+            f.write(str(item["caption"]))
+    try:
+        has_audio = media_probe.has_audio(source_path)
+        run_ffmpeg(segment_command(item, source_path, tmp, profile, has_audio, caption_file, threads),
+                   segment_seconds(item), on_progress, cancel, timeout)
+        return cache.put(key, tmp, pinned), False
+    finally:
+        for leftover in (tmp, caption_file):
+            if leftover and os.path.exists(leftover):
+                os.remove(leftover)
+
+def concat_segments(segments: List[str],
+                    out_path: str,
+                    music_gain_db: float = 0.0,
+                    duration: Optional[float] = None,
+                    on_progress: Optional[ProgressCallback] = None,
+                    cancel: Optional[threading.Event] = None,
+                    timeout: Optional[float] = None) -> None:
+    """Join segments with the concat demuxer; video is stream-copied, audio re-encoded only for a gain change."""
+    list_path = out_path + ".concat.txt"
+    with open(list_path, "w", encoding="utf-8") as f:
+        for seg in segments:
+            f.write("file '" + os.path.abspath(seg).replace("'", r"'\''") + "'\n")
+    args = [FFMPEG, "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", list_path, "-c:v", "copy"]
+    if music_gain_db:
+        args += ["-af", f"volume={10 ** (float(music_gain_db) / 20.0):.4f}", "-c:a", "aac", "-b:a", "128k"]
+    else:
+        args += ["-c:a", "copy"]
+    args += ["-movflags", "+faststart", out_path]
+    try:
+        run_ffmpeg(args, duration, on_progress, cancel, timeout)
+    finally:
+        os.remove(list_path)
+
+def crossfade_segments(segments: List[str],
+                       lengths: List[float],
+                       out_path: str,
+                       profile: OutputProfile,
+                       crossfade_ms: int,
+                       music_gain_db: float = 0.0,
+                       on_progress: Optional[ProgressCallback] = None,
+                       cancel: Optional[threading.Event] = None,
+                       timeout: Optional[float] = None) -> None:
+    """
+    Join segments with xfade/acrossfade transitions of `crossfade_ms` (capped
+    at half the shortest segment). Unlike concat_segments this re-encodes the
+    joined video, with the profile's preset and CRF.
+    """
+    fade = min(crossfade_ms / 1000.0, min(lengths) / 2)
+    args = [FFMPEG, "-y", "-v", "error"]
+    for seg in segments:
+        args += ["-i", seg]
+    filters = []
+    v, a = "[0:v]", "[0:a]"
+    offset = 0.0
+    for n in range(1, len(segments)):
+        # xfade's offset is measured on the already-joined stream, which each fade shortens
+        offset += lengths[n - 1] - fade
+        filters.append(f"{v}[{n}:v]xfade=transition=fade:duration={fade:.3f}:offset={offset:.3f}[v{n}]")
+        filters.append(f"{a}[{n}:a]acrossfade=d={fade:.3f}[a{n}]")
+        v, a = f"[v{n}]", f"[a{n}]"
+    if music_gain_db:
+        filters.append(f"{a}volume={10 ** (float(music_gain_db) / 20.0):.4f}[aout]")
+        a = "[aout]"
+    args += ["-filter_complex", ";".join(filters), "-map", v, "-map", a,
+             "-c:v", "libx264", "-preset", profile.preset, "-crf", str(profile.crf), "-pix_fmt", "yuv420p",
+             "-c:a", "aac", "-b:a", "128k", "-movflags", "+faststart", out_path]
+    run_ffmpeg(args, sum(lengths) - fade * (len(segments) - 1), on_progress, cancel, timeout)
+
+def render_segmented(assembly_plan: List[Dict[str, Any]],
+                     assets_dir: str,
+                     out_path: str,
+                     music_gain_db: float = 0.0,
+                     profile: OutputProfile = FINAL_PROFILE,
+                     cache: Optional[SegmentCache] = None,
+                     workers: Optional[int] = None,
+                     progress: Optional[ProgressCallback] = None,
+                     cancel: Optional[threading.Event] = None,
+                     timeout: Optional[float] = None,
+                     crossfade_ms: int = 0) -> Dict[str, Any]:
+    """
+    Render each item with a source file to a cached segment, then concatenate.
+    Unchanged scenes reuse their segment, so trimming scene 2 re-encodes only
+    scene 2. Cache misses are encoded `workers` at a time (each its own ffmpeg
+    process, with the CPU threads split between them); the concat is a stream
+    copy, so the result is the same as a serial render. With `crossfade_ms`
+    the segments are joined by crossfade_segments instead (one re-encode).
+    `progress` is called on the calling thread with 0..100, weighted by scene
+    length; `cancel` stops every running encode and `timeout` bounds the whole
+    render, both raising FFmpegError.
+    Returns {'path', 'segments', 'rendered', 'reused', 'workers'}.
+    """
+    cache = cache or get_segment_cache()
+    deadline = time.monotonic() + timeout if timeout else None
+    # stock placeholders have nothing to render yet
+    jobs = [(item, os.path.join(assets_dir, item["filename"])) for item in assembly_plan if item.get("filename")]
+    if not jobs:
+        raise RuntimeError("No scenes with footage to render.")
+    # pin the whole render up front: a parallel job's eviction must not drop another's segment
+    pinned = {cache.path_for(segment_key(item, src, profile)) for item, src in jobs}
+
+    lengths = [segment_seconds(item) for item, _ in jobs]
+    total = sum(lengths)
+    done = [0.0] * len(jobs)   # percent of each segment, written by the worker rendering it
+
+    def report():
+        if progress is not None:
+            progress(_SEGMENT_SHARE * sum(n * p for n, p in zip(lengths, done)) / (100.0 * total))
+
+    def job(i, threads, on_progress, stop):
+        def step(percent):
+            done[i] = percent
+            if on_progress is not None:
+                on_progress()
+        result = render_segment(*jobs[i], profile, cache, pinned, threads, step, stop, _remaining(deadline))
+        done[i] = 100.0
+        return result
+
+    cpus = os.cpu_count() or 1
+    workers = workers or DEFAULT_RENDER_WORKERS or cpus
+    workers = max(1, min(int(workers), len(jobs)))
+    if workers == 1:
+        results = []
+        for i in range(len(jobs)):
+            results.append(job(i, 0, report, cancel))
+            report()
+    else:
+        threads = max(1, cpus // workers)
+        # workers stop on their own event: the caller's cancel or any one failure ends the whole render
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="auri-render") as pool:
+            futures = [pool.submit(job, i, threads, None, stop) for i in range(len(jobs))]
+            pending = set(futures)
+            try:
+                while pending:
+                    # progress callbacks touch the UI, so they run here rather than on the workers
+                    finished, pending = wait(pending, timeout=0.25, return_when=FIRST_EXCEPTION)
+                    for future in finished:
+                        future.result()   # re-raise the first failure
+                    if cancel is not None and cancel.is_set():
+                        raise FFmpegError("cancelled", "render cancelled")
+                    _remaining(deadline)
+                    report()
+            except BaseException:
+                stop.set()
+                for future in pending:
+                    future.cancel()
+                raise
+            results = [future.result() for future in futures]
+    segments = [path for path, _ in results]
+    rendered = sum(not reused for _, reused in results)
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    concat_progress = None
+    if progress is not None:
+        concat_progress = lambda p: progress(_SEGMENT_SHARE + (100.0 - _SEGMENT_SHARE) * p / 100.0)
+    if crossfade_ms > 0 and len(segments) > 1:
+        crossfade_segments(segments, lengths, out_path, profile, crossfade_ms, music_gain_db,
+                           concat_progress, cancel, _remaining(deadline))
+    else:
+        concat_segments(segments, out_path, music_gain_db, total, concat_progress, cancel, _remaining(deadline))
+    return {"path": out_path, "segments": len(segments), "rendered": rendered,
+            "reused": len(segments) - rendered, "workers": workers}
+
+def assemble_video(assembly_plan: Sequence[Dict[str, Any]],
                    assets_dir: str,
                    out_path: str,
                    nl_edit_request: str = "",
                    music_gain_db: float = 0.0,
-                   crossfade_ms: int = 0) -> Tuple[str, str]:
+                   crossfade_ms: int = 0,
+                   profile: OutputProfile = FINAL_PROFILE,
+                   workers: Optional[int] = None,
+                   scenes: Optional[Iterable[int]] = None,
+                   progress: Optional[ProgressCallback] = None,
+                   cancel: Optional[threading.Event] = None,
+                   timeout: Optional[float] = None,
+                   export_script: bool = False) -> Tuple[str, str]:
     """
-    Apply NL edits → try moviepy → otherwise emit FFmpeg scripts and return paths.
+    Apply NL edits → render per-scene cached segments with ffmpeg → otherwise
+    try moviepy → otherwise run the single-pass ffmpeg command → otherwise
+    emit FFmpeg scripts and return paths.
+    `profile` picks the encode (PREVIEW_PROFILE for quick Studio proxies);
+    `scenes` limits the render to those scene indices. `progress` (0..100),
+    `cancel` and `timeout` apply to the ffmpeg and moviepy renders; a
+    cancelled or timed out render raises FFmpegError instead of falling back. With
+    `export_script` nothing is rendered: the .sh/.bat scripts are written.
+    Raises ValueError when no scene has uploaded footage.
     Returns (result_type, path)
-      - ("file", out_path) if moviepy rendered
+      - ("file", out_path) if ffmpeg or moviepy rendered
       - ("ffmpeg_script", sh_path) if script created
     """
     cmds = parse_nl_edit_request(nl_edit_request)
     edited_plan = apply_edit_commands(assembly_plan, cmds)
+    music_gain_db, crossfade_ms = edit_globals(cmds, music_gain_db, crossfade_ms)
+    if scenes is not None:
+        scenes = set(scenes)
+        edited_plan = [item for item in edited_plan if item["scene_index"] in scenes]
+    if not any(item.get("filename") for item in edited_plan):
+        raise ValueError("No scenes with uploaded footage to render.")
 
     os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    deadline = time.monotonic() + timeout if timeout else None
+
+    if not export_script:
+        # Segmented ffmpeg render (the only path that applies crossfades)
+        if ffmpeg_available():
+            try:
+                render_segmented(edited_plan, assets_dir, out_path, music_gain_db, profile, workers=workers,
+                                 progress=progress, cancel=cancel, timeout=_remaining(deadline),
+                                 crossfade_ms=crossfade_ms)
+                return ("file", out_path)
+            except FFmpegError as e:
+                if e.reason in ("cancelled", "timeout"):
+                    raise
+                logger.warning("segmented render failed, falling back: %s", e)
+            except (OSError, RuntimeError) as e:
+                logger.warning("segmented render failed, falling back: %s", e)
+
+        # Try moviepy render
+        ok = render_with_moviepy(edited_plan, assets_dir, out_path, music_gain_db, crossfade_ms, profile=profile,
+                                 logger=_moviepy_logger(progress, cancel, deadline))
+        if ok:
+            return ("file", out_path)
 
-    # Try moviepy render
-    ok = render_with_moviepy(edited_plan, assets_dir, out_path, music_gain_db, crossfade_ms)
-    if ok:
-        return ("file", out_path)
+        # Single-pass ffmpeg render of the same commands the script would hold
+        commands = ffmpeg_commands(edited_plan, assets_dir, out_path, music_gain_db, crossfade_ms, profile=profile)
+        if commands and ffmpeg_available():
+            duration = sum(segment_seconds(item) for item in edited_plan if item.get("filename"))
+            try:
+                run_commands(commands, duration, progress, cancel, _remaining(deadline))
+                return ("file", out_path)
+            except FFmpegError as e:
+                if e.reason in ("cancelled", "timeout"):
+                    raise
+                logger.warning("ffmpeg render failed, writing scripts instead: %s", e)
+            finally:
+                remove_work_files(out_path)   # parts, concat list and caption texts only matter during the run
 
-    # Fallback: create FFmpeg scripts
+    # Fallback (or export): create FFmpeg scripts
     sh_path, bat_path = compile_ffmpeg_script(edited_plan, assets_dir, out_path, music_gain_db, crossfade_ms)
     # Prefer returning sh; Windows users will see the .bat next to it
     return ("ffmpeg_script", sh_path)
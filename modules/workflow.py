@@ -81,8 +81,9 @@ def handle_step_execution(idx, step, input_val, uploaded_file, full_prompt):
         return
 
     def handle_script_step():
-        from modules.script import generate_script
-        from modules.video import analyze_script, plan_footage
+        import time
+        from modules.script import stream_script
+        from modules.video import ScriptSceneParser, plan_footage
         tone = st.selectbox(
             "🎭 Select a tone",
             ["Informative", "Funny", "Shocking"],
@@ -96,33 +97,48 @@ def handle_step_execution(idx, step, input_val, uploaded_file, full_prompt):
         prev_step_key = f"step_{idx-1}"
         prev_output = st.session_state["auri_context"]["step_outputs"].get(prev_step_key, "")
         user_instruction = step["user"]
-        result = generate_script(
+
+        # Stream the script and surface each scene as soon as its block closes
+        first_scene_slot = st.empty()
+        scene_feed = st.container()
+        live_script = st.empty()
+        parser = ScriptSceneParser()
+        chunks = []
+        started = time.perf_counter()
+        last_paint = 0.0
+        first_scene_at = None
+
+        def _show_scenes(scenes):
+            nonlocal first_scene_at
+            for scene in scenes:
+                if first_scene_at is None:
+                    first_scene_at = time.perf_counter() - started
+                    first_scene_slot.caption(f"⏱ First scene ready in {first_scene_at:.2f}s")
+                scene_feed.caption(f"🎞️ {scene['start']}–{scene['end']} · {scene['text'] or scene['camera'] or '—'}")
+
+        for delta in stream_script(
             goal=full_prompt,
             user_input=input_val,
             previous_output=prev_output,
             user_instruction=user_instruction,
             platform=platform,
             tone=tone
-        )
+        ):
+            chunks.append(delta)
+            _show_scenes(parser.feed(delta))
+            now = time.perf_counter()
+            if now - last_paint > 0.15:   # repaint at most ~7x/s; every token would stall the UI
+                live_script.markdown("".join(chunks))
+                last_paint = now
+        _show_scenes(parser.close())
+        result = "".join(chunks).strip()
+        live_script.markdown(result)
+
         st.session_state["executed_steps"][step_key] = result
         st.session_state["auri_context"]["step_outputs"][step_key] = result
-        parsed_script = analyze_script(result)
-        for scene in parsed_script.get("scenes", []):
-            if scene["camera"]:
-                scene["camera"] = re.sub(r"^Camera direction:\s*", "", scene["camera"], flags=re.I).strip('" ')
-            if scene["lighting"]:
-                scene["lighting"] = re.sub(r"^Lighting suggestion:\s*", "", scene["lighting"], flags=re.I).strip('" ')
-            if scene["music"]:
-                scene["music"] = re.sub(r"^Music style suggestion:\s*", "", scene["music"], flags=re.I).strip('" ')
-            if scene["transition"]:
-                scene["transition"] = re.sub(r"^Transition:\s*", "", scene["transition"], flags=re.I).strip('" ')
-            if scene["onscreen_text"]:
-                scene["onscreen_text"] = re.sub(r"^On-screen text:\s*", "", scene["onscreen_text"], flags=re.I).strip('" ')
+        parsed_script = parser.result   # field labels are stripped by the parser
         st.session_state["auri_context"]["parsed_script"] = parsed_script
         planned_footage = plan_footage(parsed_script.get("scenes", []))
-        for item in planned_footage:
-            if item["visual"]:
-                item["visual"] = clean_label(item["visual"], "Camera direction:")
         st.session_state["auri_context"]["planned_footage"] = planned_footage
         workflow = determine_workflow(result)
         st.session_state["auri_context"]["video_workflow"] = workflow
@@ -169,7 +185,7 @@ def handle_step_execution(idx, step, input_val, uploaded_file, full_prompt):
                 return
 
             import io
-            from gtts import gTTS
+            from modules.tts import synthesize_speech
             import base64
             st.warning("[DEBUG] handle_voiceover_step CALLED")
 
@@ -207,10 +223,7 @@ def handle_step_execution(idx, step, input_val, uploaded_file, full_prompt):
                             continue
                         try:
                             st.write(f"[DEBUG] Generating voiceover in-memory for scene {scene_idx}")
-                            tts = gTTS(narration_text, lang='en')
-                            buf = io.BytesIO()
-                            tts.write_to_fp(buf)
-                            buf.seek(0)
+                            buf = io.BytesIO(synthesize_speech(narration_text, lang='en'))
                             st.write(f"[DEBUG] MP3 buffer size for scene {scene_idx}: {len(buf.getvalue())} bytes")
                             audio_buffers.append(buf)
                             debug_msgs.append(f"✅ In-memory audio generated for scene {scene_idx}")
@@ -337,8 +350,10 @@ def handle_step_execution(idx, step, input_val, uploaded_file, full_prompt):
         return
 
     def handle_caption_hashtag_step():
-        from modules.captions import generate_caption
-        from modules.hashtags import generate_hashtags
+        from functools import partial
+        from modules.captions import generate_caption, generate_caption_and_hashtags
+        from modules.hashtags import generate_hashtags, format_hashtags
+        from modules.llm import fan_out, DEFAULT_MAX_IN_FLIGHT
         idea_list = st.session_state["auri_context"]["step_outputs"].get("step_1", [])
         script_list = st.session_state["auri_context"]["step_outputs"].get("step_2", [])
         if isinstance(idea_list, str):
@@ -347,35 +362,87 @@ def handle_step_execution(idx, step, input_val, uploaded_file, full_prompt):
             script_list = [line for line in script_list.split("\n") if line.strip()]
         platform = st.selectbox("📱 Select platform", ["TikTok", "Instagram", "YouTube Shorts"], key=f"platform_caption_{idx}")
         tone = st.selectbox("🎭 Select tone", ["Funny", "Inspiring", "Bold", "Shocking"], key=f"tone_caption_{idx}")
-        combined_results = []
-        captions = []
-        hashtags = []
-        for i, (idea, script) in enumerate(zip(idea_list, script_list), start=1):
+        max_in_flight = st.number_input(
+            "⚡ Parallel requests", min_value=1, max_value=16,
+            value=DEFAULT_MAX_IN_FLIGHT, step=1, key=f"max_in_flight_{idx}"
+        )
+        single_request = st.checkbox(
+            "🧩 One request per post (caption + hashtags together)",
+            value=True, key=f"caption_combined_{idx}"
+        )
+        language = st.session_state.get("auri_language", "English")
+        openai_key = st.secrets["openai"]["api_key"]
+        posts = list(zip(idea_list, script_list))
+
+        # Lay out every post first so results can land in place as they finish
+        caption_slots = []
+        hashtag_slots = []
+        for i, (idea, script) in enumerate(posts, start=1):
             st.markdown(f"### 📝 Post {i}")
             cleaned_idea = idea.split(".", 1)[-1].strip()
             st.markdown(f"<div style='font-size: 1.05rem; color: #1F2937;'>{cleaned_idea}</div>", unsafe_allow_html=True)
-            caption_result = generate_caption(
+            st.markdown("#### ✨ Suggested Caption")
+            caption_slots.append(st.empty())
+            caption_slots[-1].info("⏳ Writing caption…")
+            st.markdown("#### 🏷️ Hashtag Suggestions")
+            hashtag_slots.append(st.empty())
+            hashtag_slots[-1].info("⏳ Finding hashtags…")
+
+        # Requests for every post go out at once (bounded): either one combined
+        # caption+hashtags call per post, or a caption call and a hashtag call
+        tasks = []
+        for i, (idea, script) in enumerate(posts):
+            if single_request:
+                tasks.append(("combined", i, partial(
+                    generate_caption_and_hashtags,
+                    goal=full_prompt,
+                    platform=platform,
+                    tone=tone,
+                    idea=idea,
+                    script=script,
+                    openai_key=openai_key,
+                    language=language
+                )))
+                continue
+            tasks.append(("caption", i, partial(
+                generate_caption,
                 goal=full_prompt,
                 platform=platform,
                 tone=tone,
                 idea=idea,
                 script=script,
-                openai_key=st.secrets["openai"]["api_key"]
-            )
-            st.markdown("#### ✨ Suggested Caption")
-            st.code(caption_result, language="markdown")
-            captions.append(caption_result)
-            hashtag_result = generate_hashtags(
+                openai_key=openai_key,
+                language=language
+            )))
+            tasks.append(("hashtags", i, partial(
+                generate_hashtags,
                 goal=full_prompt,
                 idea=idea,
                 script=script,
                 platform=platform,
-                openai_key=st.secrets["openai"]["api_key"]
-            )
-            st.markdown("#### 🏷️ Hashtag Suggestions")
-            st.markdown(hashtag_result)
-            hashtags.append(hashtag_result)
-            combined_results.append(f"✨ Caption:\n{caption_result}\n\n🔖 Hashtags:\n{hashtag_result}")
+                openai_key=openai_key
+            )))
+
+        captions = [""] * len(posts)
+        hashtags = [""] * len(posts)
+        for task_idx, output in fan_out([fn for _, _, fn in tasks], max_in_flight=int(max_in_flight)):
+            kind, post_idx, _ = tasks[task_idx]
+            if kind == "combined":
+                captions[post_idx] = output["caption"]
+                hashtags[post_idx] = format_hashtags(output["hashtags"]) or "⚠️ No hashtags returned."
+                caption_slots[post_idx].code(captions[post_idx], language="markdown")
+                hashtag_slots[post_idx].markdown(hashtags[post_idx])
+            elif kind == "caption":
+                captions[post_idx] = output
+                caption_slots[post_idx].code(output, language="markdown")
+            else:
+                hashtags[post_idx] = output
+                hashtag_slots[post_idx].markdown(output)
+
+        combined_results = [
+            f"✨ Caption:\n{caption_result}\n\n🔖 Hashtags:\n{hashtag_result}"
+            for caption_result, hashtag_result in zip(captions, hashtags)
+        ]
         result = "\n\n---\n\n".join(combined_results)
         st.session_state["executed_steps"][step_key] = result
         st.session_state["auri_context"]["step_outputs"][step_key] = result
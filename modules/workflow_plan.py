@@ -0,0 +1,202 @@
+# modules/workflow_plan.py
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from modules import replay
+from modules.llm import chat_completion
+from modules.llm_cache import DEFAULT_CACHE_DIR, LLMCache
+
+WORKFLOW_PROMPT_VERSION = "workflow-plan-v1"
+
+# Quick-start recipes: fixed goals, so their plans are cached under a stable id
+QUICK_RECIPES: Dict[str, Dict[str, str]] = {
+    "tiktok_sprint": {
+        "label": "📈 Viral TikTok Sprint",
+        "prompt": "Plan 3 viral TikTok posts with script, thumbnail, and schedule",
+    },
+    "weekend_reels": {
+        "label": "🎨 Weekend Reel Builder",
+        "prompt": "Create 2 weekend Instagram Reels with catchy hooks and music",
+    },
+    "youtube_to_short": {
+        "label": "🎬 YouTube-to-Short",
+        "prompt": "Repurpose latest YouTube video into 3 Shorts with new captions",
+    },
+}
+
+AURI_CAPABILITIES = {
+    "ideas": "Generate Ideas",
+    "script": "Script Writing",
+    "caption": "Suggest Captions and Hashtags",
+    "thumbnail": "Generate Thumbnails or Cover Images",
+    "plan": "Create Content Plans",
+    "schedule": "Schedule Posts"
+}
+
+_step_re = re.compile(r"^\s*\d+\.\s*(.*?)\s+\|\s+(I will.*?)\s+\|\s+(To do that.*?)$", re.IGNORECASE)
+
+def normalize_goal(goal: str) -> str:
+    """Case-fold, collapse whitespace and drop trailing punctuation so trivially different goals share a plan."""
+    text = " ".join((goal or "").casefold().split())
+    return text.rstrip(" .!?…")
+
+def recipe_for_goal(goal: str) -> Optional[str]:
+    """Recipe id whose prompt matches `goal` after normalization, if any."""
+    norm = normalize_goal(goal)
+    for recipe_id, recipe in QUICK_RECIPES.items():
+        if normalize_goal(recipe["prompt"]) == norm:
+            return recipe_id
+    return None
+
+def plan_cache_key(goal: str, recipe_id: Optional[str] = None) -> str:
+    recipe_id = recipe_id if recipe_id in QUICK_RECIPES else recipe_for_goal(goal)
+    if recipe_id:
+        return f"{WORKFLOW_PROMPT_VERSION}:recipe:{recipe_id}"
+    return f"{WORKFLOW_PROMPT_VERSION}:goal:{normalize_goal(goal)}"
+
+def build_workflow_prompt(goal: str) -> str:
+    return f"""
+        You are Auri, an AI social media copilot that guides content creators through a complete workflow using natural language.
+
+        The user's goal is: "{goal}"
+        
+        Start by determining if the user is trying to repurpose existing content (e.g. tweets, blogs, captions, videos), or create something from scratch.
+
+        Once you have determined if the user is trying to repurpose existing content or generate new ideas:
+        - Do **not** include vague or redundant steps like “Content Review” or “Reels Concept.”
+        - Start directly from either:
+        1. Repurposing the user’s content (like tweets, blogs, past posts etc ...) into ideas, or
+        2. Generating new ideas from scratch if no input is provided or the goal requested does not require the user to share any media with you. Be flexible and match the user's prompt.
+        
+        - ❌ Do not include generic, vague steps like “Develop Concept” or “Review Content” unless they serve a clear function and require user input.
+        - Be aware of what is the logical order to execute the steps and suggest them in order (e.g. do not include a "Generate Ideas" step after "Scripting" step)
+        - If the user is repurposing content (e.g. tweets), you must not suggest generating new ideas afterward.
+
+
+        Each step must include:
+        1. A clear step title (e.g. "Generate Ideas", "Script Writing", "Upload Media")
+        2. Two subpoints:
+        - "I will..." → What Auri will autonomously handle in this step.
+        - "To do that, I’ll need you to..." → Ask the user for **only** what Auri cannot do. Phrase this as a clear instruction or question.
+
+        ⚠️ Be smart: Do not ask the user to help with tasks Auri can already do or will be able to do soon.
+
+        ✅ If the user’s request sounds narrow (e.g. only asking for ideas or a caption), fulfill that — but also suggest optional next steps Auri can help with, to complete the content creation pipeline.
+
+        At the end of your response, do the following:
+
+        - Check which of Auri’s capabilities were **not included** in the generated steps.
+        - If relevant steps are missing based on the user’s goal, suggest them as a friendly follow-up:
+
+        🧩 “Would you also like help with: [missing steps]?”
+
+        Only suggest useful and missing ones. Do not repeat steps already included.
+
+        ---
+
+        ### ✅ Auri’s CURRENT capabilities:
+        - Understand free-text goals and translate them into structured workflows.
+        - Generate content ideas and angles.
+        - Write video or carousel scripts.
+        - Suggest captions, hooks, and hashtags.
+        - Generate thumbnails or cover image prompts.
+        - Create content plans and posting schedules.
+        - Decide optimal posting times.
+        - Accept user inputs (text or uploads) when required.
+
+        ### 🔜 Auri’s FUTURE capabilities:
+        - Fully automate video editing based on scripts or uploaded footage.
+        - Track engagement and performance of posts.
+        - Analyze content to recommend changes or improvements.
+        - Automatically post and schedule content via platform integrations.
+        - Manage cross-platform content pipelines.
+        - Extract and transform data from user's past posts or analytics.
+
+        ---
+
+        ### ⚠️ You must:
+        - NEVER ask the user to do things Auri already handles.
+        - ONLY request what’s absolutely needed from the user to complete the task.
+        - Be concise, helpful, and confident.
+
+        ---
+
+        ### Format (strict):
+        1. Step Title | I will... | To do that, I’ll need you to...
+
+        No introductions. No summaries.
+        """
+
+def parse_workflow_steps(text: str) -> List[Dict[str, str]]:
+    """Parse '1. Title | I will... | To do that...' lines into step dicts."""
+    steps = []
+    for line in (text or "").split("\n"):
+        match = _step_re.match(line.strip())
+        if match:
+            steps.append({
+                "title": match.group(1).strip(),
+                "auri": match.group(2).strip(),
+                "user": match.group(3).strip()
+            })
+    return steps
+
+def missing_capabilities(steps: List[Dict[str, str]]) -> List[str]:
+    """Readable names of Auri capabilities not covered by any step title."""
+    included_titles = [step["title"].lower() for step in steps]
+    return [
+        readable for keyword, readable in AURI_CAPABILITIES.items()
+        if not any(keyword in title for title in included_titles)
+    ]
+
+_plan_cache: Optional[LLMCache] = None
+_plan_cache_lock = threading.Lock()
+
+def get_plan_cache() -> LLMCache:
+    """Process-wide store of parsed plans, shared by every session (and persisted on disk)."""
+    global _plan_cache
+    if _plan_cache is None:
+        with _plan_cache_lock:
+            if _plan_cache is None:
+                _plan_cache = LLMCache(
+                    os.path.join(DEFAULT_CACHE_DIR, "workflow_plans.sqlite3"),
+                    max_entries=500,
+                    ttl_seconds=30 * 24 * 3600,
+                )
+    return _plan_cache
+
+def generate_workflow_plan(goal: str, recipe_id: Optional[str] = None, client=None) -> Dict[str, Any]:
+    """
+    Return {"steps": [...], "missing": [...]} for a goal.
+    Plans are cached by recipe id or normalized goal, so quick recipes and
+    repeated goals skip the model entirely. Each call returns fresh copies
+    the caller may mutate. Record/replay runs bypass the cache, so they
+    always go through (and capture) the recorded model call.
+    """
+    cache = None if replay.active() else get_plan_cache()
+    key = plan_cache_key(goal, recipe_id)
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None:
+        return json.loads(cached)
+
+    if client is None:
+        from modules.openai_client import get_openai_client
+        client = get_openai_client()
+
+    recipe_id = recipe_id if recipe_id in QUICK_RECIPES else recipe_for_goal(goal)
+    prompt_goal = QUICK_RECIPES[recipe_id]["prompt"] if recipe_id else goal
+    plan_text = chat_completion(
+        client,
+        messages=[{"role": "user", "content": build_workflow_prompt(prompt_goal)}],
+        model="gpt-4o",
+        temperature=0.5,
+        prompt_version=WORKFLOW_PROMPT_VERSION,
+        step="workflow_plan",
+    )
+    steps = parse_workflow_steps(plan_text)
+    plan = {"steps": steps, "missing": missing_capabilities(steps)}
+    if steps and cache is not None:
+        cache.set(key, json.dumps(plan, ensure_ascii=False))
+    return plan
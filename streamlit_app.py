@@ -3,13 +3,17 @@ from ideation.generator import generate_ideas, is_idea_or_repurpose_step
 from modules.feedback import show_feedback_controls
 from modules.script import generate_script_step_instruction
 from modules.video import detect_video_ideas, analyze_script, determine_workflow, build_assembly_plan
-from modules.video import compute_minimal_footage, shooting_instructions
+from modules.video import compute_minimal_footage, shooting_instructions, to_plain
+from modules.timeline import format_timestamp, parse_timestamp, timeline_report
+from modules.edit_log import EditLog
 from modules.workflow import handle_step_execution
-from openai import OpenAI
+from modules.openai_client import get_openai_client
+from modules.workflow_plan import QUICK_RECIPES, generate_workflow_plan, missing_capabilities
 import re
-from PIL import Image
 
 # --- HYBRID UI HELPERS -------------------------------------------------------
+import hashlib
+import json
 import re
 from typing import List, Dict
 
@@ -139,6 +143,25 @@ def render_hybrid_output(md: str, caphash_per_idea: List[Dict[str, str]] | None
     # Optional compact CSS toggle
     if compact:
         st.markdown('<div class="compact"></div>', unsafe_allow_html=True)
+
+def _content_hash(*parts) -> str:
+    """SHA-256 over JSON-serialized parts (sorted keys), for memo keys."""
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+def _memo(store: dict, name: str, key: str, compute):
+    """
+    Return the value remembered in `store` under `name` if it was computed for
+    `key`; otherwise compute it, remember (key, value) and return it. Lets
+    Streamlit reruns skip derivations whose inputs have not changed.
+    """
+    memo = store.setdefault("_memo", {})
+    hit = memo.get(name)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    value = compute()
+    memo[name] = (key, value)
+    return value
 # --- END HYBRID UI HELPERS ----------------------------------------------------
 
 
@@ -272,20 +295,17 @@ if section == "🧠 Content Ideas":
     st.markdown("Kickstart your workflow with a smart recipe or describe your goal in plain English.")
 
     with st.expander("🌍 Quick Start Recipes"):
-        cols = st.columns(3)
-        if cols[0].button("📈 Viral TikTok Sprint"):
-            st.session_state["prompt"] = "Plan 3 viral TikTok posts with script, thumbnail, and schedule"
-        if cols[1].button("🎨 Weekend Reel Builder"):
-            st.session_state["prompt"] = "Create 2 weekend Instagram Reels with catchy hooks and music"
-        if cols[2].button("🎬 YouTube-to-Short"):
-            st.session_state["prompt"] = "Repurpose latest YouTube video into 3 Shorts with new captions"
+        cols = st.columns(len(QUICK_RECIPES))
+        for col, (recipe_id, recipe) in zip(cols, QUICK_RECIPES.items()):
+            if col.button(recipe["label"]):
+                st.session_state["prompt"] = recipe["prompt"]
+                st.session_state["recipe_id"] = recipe_id
 
     user_prompt = st.text_input("Or describe your goal...", placeholder="e.g. Turn my last 2 tweets into a carousel and reel")
 
-    client = OpenAI(api_key=st.secrets["openai"]["api_key"])
-
     if user_prompt and user_prompt != st.session_state.get("prompt", ""):
         st.session_state["prompt"] = user_prompt
+        st.session_state["recipe_id"] = None
 
     full_prompt = st.session_state.get("prompt", "").strip()
 
@@ -302,78 +322,6 @@ if section == "🧠 Content Ideas":
                 "step_titles": {}
             }
 
-        workflow_prompt = f"""
-        You are Auri, an AI social media copilot that guides content creators through a complete workflow using natural language.
-
-        The user's goal is: "{full_prompt}"
-        
-        Start by determining if the user is trying to repurpose existing content (e.g. tweets, blogs, captions, videos), or create something from scratch.
-
-        Once you have determined if the user is trying to repurpose existing content or generate new ideas:
-        - Do **not** include vague or redundant steps like “Content Review” or “Reels Concept.”
-        - Start directly from either:
-        1. Repurposing the user’s content (like tweets, blogs, past posts etc ...) into ideas, or
-        2. Generating new ideas from scratch if no input is provided or the goal requested does not require the user to share any media with you. Be flexible and match the user's prompt.
-        
-        - ❌ Do not include generic, vague steps like “Develop Concept” or “Review Content” unless they serve a clear function and require user input.
-        - Be aware of what is the logical order to execute the steps and suggest them in order (e.g. do not include a "Generate Ideas" step after "Scripting" step)
-        - If the user is repurposing content (e.g. tweets), you must not suggest generating new ideas afterward.
-
-
-        Each step must include:
-        1. A clear step title (e.g. "Generate Ideas", "Script Writing", "Upload Media")
-        2. Two subpoints:
-        - "I will..." → What Auri will autonomously handle in this step.
-        - "To do that, I’ll need you to..." → Ask the user for **only** what Auri cannot do. Phrase this as a clear instruction or question.
-
-        ⚠️ Be smart: Do not ask the user to help with tasks Auri can already do or will be able to do soon.
-
-        ✅ If the user’s request sounds narrow (e.g. only asking for ideas or a caption), fulfill that — but also suggest optional next steps Auri can help with, to complete the content creation pipeline.
-
-        At the end of your response, do the following:
-
-        - Check which of Auri’s capabilities were **not included** in the generated steps.
-        - If relevant steps are missing based on the user’s goal, suggest them as a friendly follow-up:
-
-        🧩 “Would you also like help with: [missing steps]?”
-
-        Only suggest useful and missing ones. Do not repeat steps already included.
-
-        ---
-
-        ### ✅ Auri’s CURRENT capabilities:
-        - Understand free-text goals and translate them into structured workflows.
-        - Generate content ideas and angles.
-        - Write video or carousel scripts.
-        - Suggest captions, hooks, and hashtags.
-        - Generate thumbnails or cover image prompts.
-        - Create content plans and posting schedules.
-        - Decide optimal posting times.
-        - Accept user inputs (text or uploads) when required.
-
-        ### 🔜 Auri’s FUTURE capabilities:
-        - Fully automate video editing based on scripts or uploaded footage.
-        - Track engagement and performance of posts.
-        - Analyze content to recommend changes or improvements.
-        - Automatically post and schedule content via platform integrations.
-        - Manage cross-platform content pipelines.
-        - Extract and transform data from user's past posts or analytics.
-
-        ---
-
-        ### ⚠️ You must:
-        - NEVER ask the user to do things Auri already handles.
-        - ONLY request what’s absolutely needed from the user to complete the task.
-        - Be concise, helpful, and confident.
-
-        ---
-
-        ### Format (strict):
-        1. Step Title | I will... | To do that, I’ll need you to...
-
-        No introductions. No summaries.
-        """
-
         # Check if Step 1 output includes video ideas
         prev_step_outputs = st.session_state["auri_context"].get("step_outputs", {})
         step_1_output = prev_step_outputs.get("step_1", "")
@@ -386,46 +334,23 @@ if section == "🧠 Content Ideas":
         should_force_script = detect_video_ideas(step_1_lines)
 
         if "auri_steps" not in st.session_state:
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": workflow_prompt}],
-                temperature=0.5,
-            )
-            step_lines = response.choices[0].message.content.strip().split("\n")
-            parsed_steps = []
-            for line in step_lines:
-                match = re.match(r"^\s*\d+\.\s*(.*?)\s+\|\s+(I will.*?)\s+\|\s+(To do that.*?)$", line.strip(), re.IGNORECASE)
-                if match:
-                    parsed_steps.append({
-                        "title": match.group(1).strip(),
-                        "auri": match.group(2).strip(),
-                        "user": match.group(3).strip()
-                    })
+            # Shared across sessions: quick recipes and repeated goals skip the model
+            plan = generate_workflow_plan(full_prompt, recipe_id=st.session_state.get("recipe_id"))
+            parsed_steps = plan["steps"]
+            missing_steps = plan["missing"]
             # --- Auto-insert Script Writing step if needed ---
             step_titles = [s["title"].lower() for s in parsed_steps]
             if should_force_script and not any("script" in title for title in step_titles):
                 # Pick a video idea to describe in the prompt:
                 idea_output = st.session_state["auri_context"]["step_outputs"].get("step_1", "")
                 video_idea = next((line for line in idea_output.split("\n") if any(x in line.lower() for x in ["reel", "short", "video"])), "")
-                dynamic_script_step = generate_script_step_instruction(client, idea_text=video_idea)
+                dynamic_script_step = generate_script_step_instruction(get_openai_client(), idea_text=video_idea)
                 if dynamic_script_step:
                     parsed_steps.insert(1, dynamic_script_step)
+                    missing_steps = missing_capabilities(parsed_steps)
             st.session_state["auri_steps"] = parsed_steps
 
             # Track which capabilities were included
-            included_titles = [step["title"].lower() for step in parsed_steps]
-            auri_capabilities = {
-                "ideas": "Generate Ideas",
-                "script": "Script Writing",
-                "caption": "Suggest Captions and Hashtags",
-                "thumbnail": "Generate Thumbnails or Cover Images",
-                "plan": "Create Content Plans",
-                "schedule": "Schedule Posts"
-            }
-            missing_steps = [
-                readable for keyword, readable in auri_capabilities.items()
-                if not any(keyword in title for title in included_titles)
-            ]
             st.session_state["auri_missing_suggestions"] = missing_steps
 
         steps = st.session_state["auri_steps"]
@@ -476,7 +401,7 @@ if section == "🧠 Content Ideas":
 
                         # --- Helpers (local to this block) ---
                         import re
-                        from modules.video import analyze_script, plan_footage, clean_label, build_assembly_plan
+                        from modules.video import analyze_script, plan_footage, build_assembly_plan
 
                         def split_into_ideas(markdown_text: str) -> list[tuple[str, str]]:
                             """
@@ -513,37 +438,27 @@ if section == "🧠 Content Ideas":
                                 return line.strip('“”"').strip()
                             return ""
 
-                        def normalize_scenes(parsed: dict) -> dict:
-                            """
-                            Post-clean scene fields like the previous code did.
-                            """
-                            for scene in parsed.get("scenes", []):
-                                if scene.get("camera"):
-                                    scene["camera"] = re.sub(r"^Camera direction:\s*", "", scene["camera"], flags=re.I).strip('" ')
-                                if scene.get("lighting"):
-                                    scene["lighting"] = re.sub(r"^Lighting suggestion:\s*", "", scene["lighting"], flags=re.I).strip('" ')
-                                if scene.get("music"):
-                                    scene["music"] = re.sub(r"^Music style suggestion:\s*", "", scene["music"], flags=re.I).strip('" ')
-                                if scene.get("transition"):
-                                    scene["transition"] = re.sub(r"^Transition:\s*", "", scene["transition"], flags=re.I).strip('" ')
-                                if scene.get("onscreen_text"):
-                                    scene["onscreen_text"] = re.sub(r"^On-screen text:\s*", "", scene["onscreen_text"], flags=re.I).strip('" ')
-                            return parsed
-
                         # Keep per‑idea data in session
                         if "ideas_data" not in st.session_state["auri_context"]:
                             st.session_state["auri_context"]["ideas_data"] = {}
 
-                        ideas = split_into_ideas(result)
+                        # Derivations below are memoized on content hashes, so a rerun only
+                        # recomputes ideas whose markdown (or scene selections) changed.
+                        ideas_data = st.session_state["auri_context"]["ideas_data"]
+                        ideas = _memo(ideas_data, "split", _content_hash(result),
+                                      lambda: split_into_ideas(result))
 
                         # --- Compact list of idea cards ---
                         for idx, (idea_id, idea_md) in enumerate(ideas, start=1):
                             idea_key = f"idea_{idx}"
-                            idea_store = st.session_state["auri_context"]["ideas_data"].setdefault(idea_key, {})
+                            idea_store = ideas_data.setdefault(idea_key, {})
+                            md_hash = _content_hash(idea_md)
 
                             # Extract small header bits
-                            title = extract_field(idea_md, "🎬 Title") or f"Idea {idx}"
-                            hook = extract_field(idea_md, "🧲 Hook")
+                            title, hook = _memo(idea_store, "header", md_hash, lambda: (
+                                extract_field(idea_md, "🎬 Title") or f"Idea {idx}",
+                                extract_field(idea_md, "🧲 Hook"),
+                            ))
 
                             # Card UI (minimal CSS via markdown)
                             st.markdown(
@@ -568,16 +483,14 @@ if section == "🧠 Content Ideas":
                                 preview = idea_md
                                 st.markdown(preview)
 
-                                # Parse -> scenes
-                                parsed = analyze_script(idea_md)
-                                parsed = normalize_scenes(parsed)
+                                # Parse -> scenes (field labels are stripped by the parser)
+                                parsed = _memo(idea_store, "parsed_script", md_hash,
+                                               lambda: analyze_script(idea_md))
                                 idea_store["parsed_script"] = parsed
 
                                 # Plan footage
-                                planned = plan_footage(parsed.get("scenes", []))
-                                for item in planned:
-                                    if item.get("visual"):
-                                        item["visual"] = clean_label(item["visual"], "Camera direction:")
+                                planned = _memo(idea_store, "planned_footage", md_hash,
+                                                lambda: plan_footage(parsed.get("scenes", [])))
                                 idea_store["planned_footage"] = planned
 
                                 # Init per-scene selections storage
@@ -585,6 +498,13 @@ if section == "🧠 Content Ideas":
                                     idea_store["scene_selections"] = {}
 
                                 st.markdown("### 🎞️ Scenes")
+                                report = _memo(idea_store, "timeline_report", md_hash,
+                                               lambda: timeline_report(parsed.get("scenes", [])))
+                                for gap_start, gap_end in report["gaps"]:
+                                    st.caption(f"⚠️ No scene covers {format_timestamp(gap_start)}–{format_timestamp(gap_end)}")
+                                for first, second, ov_start, ov_end in report["overlaps"]:
+                                    st.caption(f"⚠️ Scenes {first} and {second} overlap at "
+                                               f"{format_timestamp(ov_start)}–{format_timestamp(ov_end)}")
                                 if not planned:
                                     st.info("No scenes detected yet. Try regenerating or simplifying the script format.")
                                 else:
@@ -623,9 +543,10 @@ if section == "🧠 Content Ideas":
 
                                 # Build plan
                                 st.subheader("🎬 Assembly Plan")
-                                assembly_plan = build_assembly_plan(
-                                    idea_store.get("planned_footage", []),
-                                    idea_store.get("scene_selections", {}),
+                                assembly_plan = _memo(
+                                    idea_store, "assembly_plan",
+                                    _content_hash(md_hash, idea_store.get("scene_selections", {})),
+                                    lambda: build_assembly_plan(planned, idea_store.get("scene_selections", {})),
                                 )
                                 idea_store["assembly_plan"] = assembly_plan
 
@@ -646,18 +567,22 @@ if section == "🧠 Content Ideas":
 
                                 # Shooting guide
                                 st.markdown("### 🎥 Shooting Guide")
-                                guide = shooting_instructions(parsed)
+                                guide = _memo(idea_store, "shooting_guide", md_hash,
+                                              lambda: shooting_instructions(parsed))
                                 for g in guide:
                                     st.markdown(f"- {g}")
 
                                 # Minimal footage checklist (deduped)
                                 st.markdown("### ✅ Minimal Footage Checklist")
-                                checklist = compute_minimal_footage(idea_store.get("planned_footage", []))
+                                checklist = _memo(idea_store, "minimal_footage", md_hash,
+                                                  lambda: compute_minimal_footage(planned))
                                 if not checklist:
                                     st.info("No custom shots required — stock footage should be sufficient.")
                                 else:
                                     for shot in checklist:
-                                        st.markdown(f"- **{shot.shot_type}**, ~{shot.duration:.1f}s — {shot.description}")
+                                        covers = ", ".join(str(i + 1) for i in shot.scene_indices)
+                                        st.markdown(f"- **{shot.shot_type}**, ~{shot.duration:.1f}s — {shot.description} "
+                                                    f"(scene{'s' if len(shot.scene_indices) > 1 else ''} {covers})")
 
                                 # Missing uploads quick check
                                 missing = [it for it in assembly_plan if (not it.get("use_stock")) and (not it.get("filename"))]
@@ -672,11 +597,12 @@ if section == "🧠 Content Ideas":
                                         import os
                                         # Stash studio context for a smooth handoff
                                         studio = st.session_state.setdefault("video_studio", {})
+                                        if studio.get("idea_key") != idea_key or studio.get("assembly_plan") is not assembly_plan:
+                                            studio["edit_log"] = EditLog(assembly_plan)   # edits apply to this plan only
                                         studio["idea_key"] = idea_key
                                         studio["assembly_plan"] = assembly_plan
                                         studio["assets_dir"] = "."
                                         studio["out_path"] = os.path.join("exports", idea_key, "final_video.mp4")
-                                        studio.setdefault("edit_history", [])   # cumulative NL instructions
                                         studio.setdefault("last_video_path", None)
 
                                         # If you already generate voiceovers and save them, surface here (optional)
@@ -726,11 +652,11 @@ if section == "🧠 Content Ideas":
 
             if parsed_script:
                 st.subheader("🎬 Parsed Script Scenes")
-                st.json(parsed_script)
+                st.json({**parsed_script, "scenes": to_plain(parsed_script.get("scenes", []))})
 
             if planned_footage:
                 st.subheader("📹 Planned Footage")
-                st.json(planned_footage)
+                st.json(to_plain(planned_footage))
 
             if video_workflow:
                 st.subheader("⚙️ Workflow Analysis")
@@ -757,8 +683,14 @@ elif section == "🎨 Editing Studio":
     st.markdown("## 🎨 Editing Studio")
     # ---- VIDEO STUDIO (place this inside your "Editing Studio" tab code) ----
     import os
+    import threading
+    from modules.ffmpeg_runner import FFmpegError
+    from modules.video import FINAL_PROFILE, PREVIEW_PROFILE
     from modules.video_editor import assemble_video
 
+    # seconds a render may take before ffmpeg is stopped; unset/0 = no limit
+    RENDER_TIMEOUT = float(os.environ.get("AURI_RENDER_TIMEOUT", "0") or 0) or None
+
     # If you have a tabset inside Editing Studio, select the "Video" tab by default:
     # Example:
     # video_tab, thumb_tab = st.tabs(["🎬 Video", "🖼 Thumbnails"])
@@ -774,16 +706,39 @@ elif section == "🎨 Editing Studio":
         assembly_plan = studio["assembly_plan"]
         assets_dir   = studio.get("assets_dir", ".")
         out_path     = studio.get("out_path", os.path.join("exports", idea_key, "final_video.mp4"))
-        edit_history = studio.get("edit_history", [])
+        edit_log     = studio.get("edit_log") or studio.setdefault("edit_log", EditLog(assembly_plan))
         scene_vos    = studio.get("scene_voiceovers")   # optional
         global_vo    = studio.get("global_voiceover")   # optional
 
-        # TOP: Always show the most recent video
+        preview_path = os.path.splitext(out_path)[0] + "_preview.mp4"
+
+        # Set by the Cancel button; the render in flight polls it and stops ffmpeg/MoviePy
+        render_cancel = studio.setdefault("render_cancel", threading.Event())
+        if studio.pop("render_cancelled", False):
+            st.info("Render cancelled.")
+
+        # TOP: Always show the most recent video (a low-res preview after Apply, the full cut after Export)
         last_path = studio.get("last_video_path")
+        last_scenes = studio.get("last_video_scenes")   # None = every scene
         if last_path and os.path.exists(last_path):
-            st.video(last_path)
+            if last_path == preview_path:
+                st.caption("Preview (360p, 15 fps)" + (
+                    f" of scenes {', '.join(str(s + 1) for s in sorted(last_scenes))}" if last_scenes else ""))
+            # Seek by timestamp; the rendered timeline tells which scene plays there
+            seek_text = st.text_input("⏩ Jump to (e.g. 0:12 or 12.5)", key=f"seek_{idea_key}")
+            start_time = 0
+            if seek_text.strip():
+                try:
+                    start_time = parse_timestamp(seek_text)
+                except ValueError:
+                    st.warning("Use seconds (12.5) or m:ss (0:12).")
+                hit = edit_log.timeline().first_at(start_time) if not last_scenes else None
+                if hit:
+                    st.caption(f"Scene {hit.item['scene_index'] + 1} "
+                               f"({format_timestamp(hit.start)}–{format_timestamp(hit.end)})")
+            st.video(last_path, start_time=int(start_time))
         else:
-            st.info("No render yet. Add an edit and click Apply, or click Render to produce the first cut.")
+            st.info("No render yet. Add an edit and click Apply for a quick preview, or Export the full cut.")
 
         # NL editing box
         nl = st.text_area(
@@ -792,58 +747,124 @@ elif section == "🎨 Editing Studio":
             key=f"nl_edits_{idea_key}"
         )
 
-        colA, colB, colC = st.columns(3)
+        changed_only = st.checkbox("Preview only the changed scenes (and their neighbors)", value=True,
+                                   key=f"preview_changed_{idea_key}")
+
+        colA, colB, colC, colD, colE, colF = st.columns(6)
         with colA:
             apply_clicked = st.button("✅ Apply edits", key=f"apply_edits_{idea_key}")
         with colB:
-            render_clicked = st.button("▶ Render (no new edits)", key=f"render_now_{idea_key}")
+            render_clicked = st.button("⬇️ Export full quality", key=f"render_now_{idea_key}")
         with colC:
+            undo_clicked = st.button("↩️ Undo", key=f"undo_edit_{idea_key}", disabled=not edit_log.can_undo())
+        with colD:
+            redo_clicked = st.button("↪️ Redo", key=f"redo_edit_{idea_key}", disabled=not edit_log.can_redo())
+        with colE:
             reset_clicked = st.button("♻️ Reset edits", key=f"reset_edits_{idea_key}")
-
-        # Helper to run assembly (MoviePy -> fallback to FFmpeg script)
-        def _assemble_with(nl_text: str):
-            # Ensure default timing/edit fields exist
-            for item in assembly_plan:
-                item.setdefault("start_seconds", 0.0)
-                item.setdefault("end_seconds", item.get("start_seconds", 0.0) + 1.0)
-                item.setdefault("speed", 1.0)
-                item.setdefault("zoom", None)
-                item.setdefault("caption", None)
-
-            os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
-            result_type, path = assemble_video(
-                assembly_plan=assembly_plan,
-                assets_dir=assets_dir,
-                out_path=out_path,
-                nl_edit_request=nl_text,
-                music_gain_db=0.0,
-                crossfade_ms=0
-                # If you extend assemble_video to accept VO (recommended), pass:
-                # scene_voiceovers=scene_vos,
-                # global_voiceover=global_vo
-            )
+        with colF:
+            script_clicked = st.button("📜 Export FFmpeg script", key=f"export_script_{idea_key}")
+
+        applied = edit_log.history()
+        if applied:
+            with st.expander(f"🧾 Applied edits ({len(applied)})"):
+                for n, text in enumerate(applied, start=1):
+                    st.markdown(f"{n}. {text}")
+
+        # Helper to run assembly (ffmpeg segments -> MoviePy -> fallback to FFmpeg script)
+        def _assemble_with(entry, preview: bool, scenes=None):
+            # The log's snapshot is already edited; only the render-time globals are passed along
+            target = preview_path if preview else out_path
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            label = "Rendering preview…" if preview else "Exporting…"
+            bar = st.progress(0, text=label)
+            render_cancel.clear()
+
+            def _cancel():
+                render_cancel.set()
+                studio["render_cancelled"] = True
+
+            st.button("⏹ Cancel render", key=f"cancel_render_{idea_key}", on_click=_cancel)
+            try:
+                result_type, path = assemble_video(
+                    assembly_plan=entry.plan,
+                    assets_dir=assets_dir,
+                    out_path=target,
+                    music_gain_db=entry.music_gain_db,
+                    crossfade_ms=entry.crossfade_ms,
+                    profile=PREVIEW_PROFILE if preview else FINAL_PROFILE,
+                    scenes=scenes,
+                    progress=lambda pct: bar.progress(int(pct), text=f"{label} {pct:.0f}%"),
+                    cancel=render_cancel,
+                    timeout=RENDER_TIMEOUT,
+                    # If you extend assemble_video to accept VO (recommended), pass:
+                    # scene_voiceovers=scene_vos,
+                    # global_voiceover=global_vo
+                )
+            except FFmpegError as e:
+                bar.empty()
+                if e.reason == "cancelled":
+                    studio.pop("render_cancelled", None)
+                    st.info("Render cancelled.")
+                    return
+                st.error(f"Render timed out after {RENDER_TIMEOUT:g}s." if e.reason == "timeout" else f"Render failed: {e}")
+                if e.stderr_tail:
+                    with st.expander("ffmpeg output"):
+                        st.code(e.stderr_tail)
+                return
+            except ValueError as e:   # nothing to render: no scene has an uploaded clip yet
+                bar.empty()
+                st.warning(f"{e} Upload clips for the scenes in the Script card first.")
+                return
+            bar.empty()
             if result_type == "file":
                 studio["last_video_path"] = path
-                st.success("Rendered ✅")
+                studio["last_video_scenes"] = scenes
+                st.success("Preview ready ✅" if preview else f"Exported ✅ {path}")
                 st.rerun()  # refresh the video container
             else:
                 # FFmpeg script path returned — show it and keep current preview
-                st.warning("MoviePy not available — generated an FFmpeg script instead.")
+                st.warning("Neither ffmpeg nor MoviePy is available — generated an FFmpeg script instead.")
                 st.code(f"bash {path}", language="bash")
 
         if apply_clicked:
-            if nl.strip():
-                edit_history.append(nl.strip())
-                studio["edit_history"] = edit_history
-                _assemble_with("\n".join(edit_history))
-            else:
+            if not nl.strip():
                 st.info("No new instructions to apply.")
+            elif edit_log.apply(nl) is None:
+                st.warning("Couldn't find an edit in that. Try e.g. \"trim scene 2 to 1.5s\".")
+            else:
+                _assemble_with(edit_log.current, preview=True,
+                               scenes=edit_log.preview_scenes() if changed_only else None)
 
         if render_clicked:
-            _assemble_with("\n".join(edit_history))
+            _assemble_with(edit_log.current, preview=False)
+
+        if script_clicked:
+            entry = edit_log.current
+            try:
+                _, sh_path = assemble_video(
+                    assembly_plan=entry.plan,
+                    assets_dir=assets_dir,
+                    out_path=out_path,
+                    music_gain_db=entry.music_gain_db,
+                    crossfade_ms=entry.crossfade_ms,
+                    export_script=True,
+                )
+            except ValueError as e:
+                st.warning(f"{e} Upload clips for the scenes in the Script card first.")
+            else:
+                st.success("FFmpeg scripts written (a .bat for Windows sits next to the .sh).")
+                st.code(f"bash {sh_path}", language="bash")
+
+        if undo_clicked:
+            edit_log.undo()
+            st.rerun()
+
+        if redo_clicked:
+            edit_log.redo()
+            st.rerun()
 
         if reset_clicked:
-            studio["edit_history"] = []
+            edit_log.reset()
             st.success("Edits reset. Render again to go back to the base plan.")
 
     st.markdown("### 🖼️ Thumbnail Generator")
@@ -891,7 +912,7 @@ elif section == "🎨 Editing Studio":
     # ----------------------------
     if generate_ai:
         with st.spinner("Generating AI Image..."):
-            from modules.thumbnail import generate_thumbnail_prompt, download_image
+            from modules.thumbnail import generate_thumbnail_prompt, generate_ai_image, download_image
 
             script_text = step_outputs.get("step_2", "")
             hashtags = step_outputs.get("step_3", "")
@@ -904,15 +925,7 @@ elif section == "🎨 Editing Studio":
                 custom_style
             )
 
-            client = OpenAI(api_key=st.secrets["openai"]["api_key"])
-
-            response = client.images.generate(
-                model="dall-e-3",
-                prompt=prompt,
-                n=1,
-                size="1024x1024"
-            )
-            image_url = response.data[0].url
+            image_url = generate_ai_image(prompt)
             st.image(image_url, caption="AI Generated Thumbnail")
             download_image(image_url, "ai_thumbnail.jpg")
             base_image_path = "ai_thumbnail.jpg"
@@ -925,6 +938,7 @@ elif section == "🎨 Editing Studio":
         from modules.thumbnail import create_thumbnail
 
         if uploaded_file:
+            from PIL import Image
             image = Image.open(uploaded_file)
             # Convert RGBA to RGB if needed
             if image.mode == "RGBA":
@@ -959,3 +973,30 @@ elif section == "🗖️ Posting & Scheduling":
 elif section == "📊 Analytics":
     st.markdown("## 📊 Performance Analytics")
     st.info("Auri will track and summarize your content performance.")
+
+    # --- AI usage: latency, tokens and cost per step (this server process) ---
+    from modules.llm_metrics import get_llm_metrics
+    from modules.llm_cache import get_llm_cache
+
+    st.markdown("### ⚙️ AI Usage")
+    metrics = get_llm_metrics()
+    records = metrics.records()
+    if not records:
+        st.caption("No AI calls recorded yet. Run a workflow step to see timings and costs here.")
+    else:
+        summary = metrics.summary()
+        cache_stats = get_llm_cache().stats()
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Calls", len(records))
+        m2.metric("Est. cost", f"${sum(row['cost_usd'] for row in summary):.4f}")
+        m3.metric("Avg latency", f"{sum(r.wall_time for r in records) / len(records):.2f}s")
+        m4.metric("Cache hit rate", f"{cache_stats['hit_rate'] * 100:.0f}%")
+        st.dataframe(summary, use_container_width=True)
+        with st.expander("🔍 Recent calls"):
+            st.dataframe([r.to_dict() for r in records[-50:]][::-1], use_container_width=True)
+        st.download_button(
+            "⬇️ Export calls (JSONL)",
+            data=metrics.to_jsonl(records),
+            file_name="auri_llm_calls.jsonl",
+            mime="application/jsonl",
+        )